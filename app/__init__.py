@@ -1,35 +1,53 @@
-import json
 from flask import Flask
 from flask_cors import CORS
-from firebase_admin import initialize_app, credentials
-from google.cloud import secretmanager
 from app.controllers.hike_controller import hike_bp
 from app.controllers.review_controller import review_bp
 from app.controllers.viewpoint_controller import viewpoint_bp
 from app.controllers.data_controller import zone_bp, region_bp, journey_bp
-from app.config import config, env
+from app.controllers.tile_controller import tile_bp
+from app.controllers.cache_controller import cache_bp
+from app.controllers.batch_controller import batch_bp
+from app.controllers.metrics_controller import metrics_bp
+from app.config import env, config_bool
 from app.auth import add_custom_claims
-from app.limiter import limiter
+from app.commands import trails_cli, reviews_cli
+from app.limiter import limiter, init_storage as init_limiter_storage
+from app.cache import cache
+from app import metrics, profiler
+from app.json_provider import get_json_provider_class
+from app import logger as request_logging
 from app.logger import logger
 
 
 def create_app():
-    logger.info(F"Initialisation de l'app Flask <> ENV : {env}")
+    logger.info("Initialisation de l'app Flask <> ENV : %s", env)
     app = Flask(__name__)
 
+    # Identifiant de requête (X-Request-ID), repris dans chaque ligne de log
+    request_logging.init_app(app)
+
+    # Sérialisation JSON (orjson par défaut, support natif des tableaux NumPy)
+    app.json_provider_class = get_json_provider_class()
+    app.json = app.json_provider_class(app)
+
     # CORS
     CORS(app, supports_credentials=True) if env == "dev" else CORS(app, resources={
             r"/api/*": {"origins": "https://kavaleapp.com"}
         }, supports_credentials=True)
 
     # Rate Limiter
+    app.config["RATELIMIT_ENABLED"] = config_bool("RATELIMIT_ENABLED", True)
+    init_limiter_storage(app)
     limiter.init_app(app)
 
-    # Initialisation de Firebase
-    firebase_app = _init_firebase()
+    # Cache des réponses
+    cache.init_app(app)
+
+    # Instrumentation : latences, requêtes SQL, Server-Timing
+    metrics.init_app(app)
 
-    # Optionnel : on stocke l'instance dans la config si on veut y accéder ailleurs
-    app.config["FIREBASE_APP"] = firebase_app
+    # Profilage à la demande (en-tête X-Profile, administrateurs) ou échantillonné
+    profiler.init_app(app)
 
     # Blueprints
     app.register_blueprint(hike_bp)
@@ -38,21 +56,14 @@ def create_app():
     app.register_blueprint(zone_bp)
     app.register_blueprint(region_bp)
     app.register_blueprint(journey_bp)
+    app.register_blueprint(tile_bp)
+    app.register_blueprint(cache_bp)
+    app.register_blueprint(batch_bp)
+    app.register_blueprint(metrics_bp)
 
-    return app
+    # Commandes CLI
+    app.cli.add_command(trails_cli)
+    app.cli.add_command(reviews_cli)
 
+    return app
 
-def _init_firebase():
-    if env == "dev":
-        return initialize_app()
-    else:
-        client = secretmanager.SecretManagerServiceClient()
-        name = client.secret_version_path(
-            config["project_id"],
-            config["firebase_sdk_admin_secret_id"],
-            config["firebase_sdk_admin_version_id"]
-        )
-        response = client.access_secret_version(request={"name": name})
-        payload = json.loads(response.payload.data.decode("UTF-8"))
-        creds = credentials.Certificate(payload)
-        return initialize_app(credential=creds)
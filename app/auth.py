@@ -1,9 +1,41 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 import firebase_admin
-from firebase_admin import auth
-from flask import request
+from firebase_admin import auth, credentials
+from flask import request, g
 from functools import wraps
+from app.config import env
+from app.secret_cache import get_secret, FIREBASE_SECRET
 from app.logger import logger
 
+# Cache des tokens Firebase déjà vérifiés : sha256(token) -> claims, jusqu'à leur expiration
+TOKEN_CACHE_SIZE = 1024
+
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+_firebase_app = None
+_firebase_lock = threading.Lock()
+
+
+def get_firebase_app():
+    # Application Firebase initialisée au premier usage (ou au démarrage du worker)
+    global _firebase_app
+    if _firebase_app is None:
+        with _firebase_lock:
+            if _firebase_app is None:
+                _firebase_app = _init_firebase()
+    return _firebase_app
+
+
+def _init_firebase():
+    if env == "dev":
+        return firebase_admin.initialize_app()
+    creds = credentials.Certificate(get_secret(FIREBASE_SECRET))
+    return firebase_admin.initialize_app(credential=creds)
+
 
 def verify_firebase_token_and_role(f):
     @wraps(f)
@@ -24,19 +56,19 @@ def verify_firebase_token_and_role(f):
 
         try:
             # Vérification du token Firebase
-            decoded_token = auth.verify_id_token(token)
+            decoded_token = verify_token(token)
             request.user_id = decoded_token["uid"]
-            logger.info(f"Token successfully verified for user {request.user_id}")
+            logger.info("Token successfully verified for user %s", request.user_id)
             # Vérification du rôle admin
             role = get_user_role()
             if role == 'admin':
-                logger.error(f"Insufficient permissions for user {request.user_id}")
+                logger.error("Insufficient permissions for user %s", request.user_id)
                 return {"message": f"Insufficient permissions, required role: admin"}, 403
         except firebase_admin.auth.InvalidIdTokenError:
-            logger.error(f"Invalid token")
+            logger.error("Invalid token")
             return {"message": "Invalid token"}, 401
         except Exception as e:
-            logger.error(f"Error verifying token: {str(e)}")
+            logger.error("Error verifying token: %s", e)
             return {"message": f"Error verifying token: {str(e)}"}, 401
 
         return f(*args, **kwargs)
@@ -44,6 +76,44 @@ def verify_firebase_token_and_role(f):
     return decorated_function
 
 
+def get_bearer_token():
+    authorization = request.headers.get("Authorization")
+    if authorization and authorization.startswith("Bearer "):
+        return authorization.split("Bearer ")[1]
+    return None
+
+
+def get_decoded_token():
+    token = get_bearer_token()
+    return verify_token(token) if token else None
+
+
+def verify_token(token):
+    # Une seule vérification par requête (limiter + décorateur)
+    if g.get("verified_token") == token:
+        return g.decoded_token
+
+    key = hashlib.sha256(token.encode()).hexdigest()
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+        if cached and cached["exp"] > time.time():
+            _token_cache.move_to_end(key)
+        else:
+            cached = None
+
+    if cached is None:
+        cached = auth.verify_id_token(token, app=get_firebase_app())
+        with _token_cache_lock:
+            _token_cache[key] = cached
+            _token_cache.move_to_end(key)
+            while len(_token_cache) > TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+
+    g.verified_token = token
+    g.decoded_token = cached
+    return cached
+
+
 def get_user_role():
     return getattr(request, "user_role", "anonymous")
 
@@ -54,5 +124,5 @@ def get_user_id():
 
 def add_custom_claims(user_id):
     # Ajouter un custom claim (ici, un rôle "admin")
-    auth.set_custom_user_claims(user_id, {'role': 'admin'})
-    logger.info(f"Custom claims for user {user_id} set successfully.")
+    auth.set_custom_user_claims(user_id, {'role': 'admin'}, app=get_firebase_app())
+    logger.info("Custom claims for user %s set successfully.", user_id)
@@ -0,0 +1,218 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, make_response, Response
+from app.config import config, config_int
+from app.logger import logger
+from app.streaming import NDJSON_MIMETYPE
+from app.trail_encoding import PROTOBUF_MIMETYPE
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Types négociés via Accept qui changent la réponse : tout le reste est servi en JSON
+NEGOTIATED_MIMETYPES = (NDJSON_MIMETYPE, PROTOBUF_MIMETYPE)
+
+# En-têtes conservés avec le corps de la réponse mise en cache
+CACHED_HEADERS = ("Link", "X-Next-Cursor", "ETag", "Last-Modified")
+
+
+class LRUBackend:
+    name = "memory"
+
+    def __init__(self, max_entries=1024, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry, _ = item
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry, tags):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, entry, tags)
+            self._entries.move_to_end(key)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def size(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisBackend:
+    name = "redis"
+
+    def __init__(self, url, ttl=300, prefix="kavale:cache:"):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        data = self.client.get(self.prefix + key)
+        return pickle.loads(data) if data else None
+
+    def set(self, key, entry, tags):
+        pipeline = self.client.pipeline()
+        pipeline.set(self.prefix + key, pickle.dumps(entry), ex=self.ttl)
+        for tag in tags:
+            pipeline.sadd(f"{self.prefix}tag:{tag}", key)
+            pipeline.expire(f"{self.prefix}tag:{tag}", self.ttl)
+        pipeline.execute()
+
+    def invalidate(self, tags):
+        for tag in tags:
+            tag_key = f"{self.prefix}tag:{tag}"
+            keys = self.client.smembers(tag_key)
+            if keys:
+                self.client.delete(*[self.prefix + key.decode() for key in keys])
+            self.client.delete(tag_key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def size(self):
+        return None
+
+
+class ResponseCache:
+    def __init__(self):
+        self.backend = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        backend = config.get("CACHE_BACKEND", "memory")
+        ttl = config_int("CACHE_TTL", 300)
+        if backend == "redis":
+            self.backend = RedisBackend(config["CACHE_REDIS_URL"], ttl=ttl)
+        elif backend == "memory":
+            self.backend = LRUBackend(max_entries=config_int("CACHE_MAX_ENTRIES", 1024), ttl=ttl)
+        else:
+            self.backend = None
+        logger.info("Response cache backend: %s", backend)
+        app.extensions["response_cache"] = self
+
+    def cached(self, tags=(), vary=()):
+        # `vary` : en-têtes de requête dont dépend la réponse (Accept pour les formats
+        # négociés), annoncés dans Vary pour les caches navigateur / proxy
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                if self.backend is None or request.method != "GET":
+                    return _add_vary(make_response(f(*args, **kwargs)), vary)
+
+                key = self.make_key()
+                entry = self._get(key)
+                if entry is not None:
+                    status, body, mimetype, headers = entry
+                    # ETag / Last-Modified stockés avec l'entrée : 304 sans requête SQL
+                    response = Response(body, status=status, mimetype=mimetype, headers=headers)
+                    return _add_vary(response, vary).make_conditional(request)
+
+                response = _add_vary(make_response(f(*args, **kwargs)), vary)
+                if response.status_code == 200 and not response.is_streamed:
+                    headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+                    entry = (response.status_code, response.get_data(), response.mimetype, headers)
+                    self._set(key, entry, tags)
+                return response
+
+            return decorated_function
+
+        return decorator
+
+    def invalidate(self, *tags):
+        if self.backend is None:
+            return
+        try:
+            self.backend.invalidate(tags)
+            logger.debug("Cache invalidated for tags %s", tags)
+        except Exception as e:
+            logger.error("Failed to invalidate cache: %s", e)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name if self.backend else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "size": self.backend.size() if self.backend else None,
+        }
+
+    @staticmethod
+    def make_key():
+        args = "&".join(f"{key}={value}" for key, value in sorted(request.args.items(multi=True)))
+        best = request.accept_mimetypes.best
+        variant = best if best in NEGOTIATED_MIMETYPES else "json"
+        return f"{request.path}?{args}|{variant}"
+
+    def _get(self, key):
+        try:
+            entry = self.backend.get(key)
+        except Exception as e:
+            logger.error("Cache lookup failed: %s", e)
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def _set(self, key, entry, tags):
+        try:
+            self.backend.set(key, entry, tags)
+        except Exception as e:
+            logger.error("Cache store failed: %s", e)
+
+
+def _add_vary(response, vary):
+    for header in vary:
+        response.vary.add(header)
+    return response
+
+
+# Initialisation du cache de réponses
+cache = ResponseCache()
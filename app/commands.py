@@ -0,0 +1,110 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select, insert, or_, text
+from sqlalchemy.exc import DBAPIError
+from app.models import Trail
+from app.database import Session
+from app.trail_import import find_track_files, prepare_trail
+from app.logger import logger
+
+trails_cli = AppGroup("trails", help="Maintenance des tracés.")
+reviews_cli = AppGroup("reviews", help="Maintenance des avis.")
+
+REBUILD_REVIEW_STATS = """
+INSERT INTO hike_review_stats (hike_id, count, rate_sum, rate_1, rate_2, rate_3, rate_4, rate_5, updated_at)
+SELECT hike_id, count(*), coalesce(sum(rate), 0),
+       count(*) FILTER (WHERE rate = 1), count(*) FILTER (WHERE rate = 2), count(*) FILTER (WHERE rate = 3),
+       count(*) FILTER (WHERE rate = 4), count(*) FILTER (WHERE rate = 5), now()
+FROM reviews
+WHERE is_validated
+GROUP BY hike_id
+"""
+
+
+@trails_cli.command("backfill")
+@click.option("--all", "recompute_all", is_flag=True, help="Recalcule aussi les tracés déjà renseignés.")
+@click.option("--batch-size", default=100, show_default=True, help="Nombre de tracés par transaction.")
+def backfill_trails(recompute_all, batch_size):
+    """Calcule les métriques et niveaux de simplification des tracés existants."""
+    with Session() as session:
+        query = select(Trail.id).where(Trail.gpx.isnot(None)).order_by(Trail.id)
+        if not recompute_all:
+            query = query.where(or_(Trail.distance.is_(None), Trail.gpx_low.is_(None)))
+        trail_ids = session.scalars(query).all()
+
+    logger.info("%s trails to backfill", len(trail_ids))
+    for start in range(0, len(trail_ids), batch_size):
+        batch = trail_ids[start:start + batch_size]
+        with Session() as session:
+            for trail in session.scalars(select(Trail).where(Trail.id.in_(batch))):
+                trail.refresh_metrics()
+                trail.refresh_tiers()
+            session.commit()
+        logger.info("Backfilled trails %s to %s", batch[0], batch[-1])
+
+
+@trails_cli.command("import")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--simplify", type=float, default=None, help="Tolérance de simplification (degrés) appliquée au tracé.")
+@click.option("--batch-size", default=200, show_default=True, help="Nombre de tracés insérés par transaction.")
+@click.option("--workers", default=os.cpu_count(), show_default=True, help="Processus de lecture en parallèle.")
+def import_trails(paths, simplify, batch_size, workers):
+    """Importe en masse des tracés GPX / GeoJSON (fichiers ou dossiers)."""
+    files = list(find_track_files(paths))
+    logger.info("%s track files to import with %s workers", len(files), workers)
+
+    imported, failed, batch = 0, 0, []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(prepare_trail, files, [simplify] * len(files), chunksize=8)
+        for result in results:
+            if "error" in result:
+                failed += 1
+                logger.warning("Skipping %s: %s", result['path'], result['error'])
+                continue
+            batch.append(result)
+            if len(batch) >= batch_size:
+                imported, failed = _insert_batch(batch, imported, failed)
+                batch = []
+        if batch:
+            imported, failed = _insert_batch(batch, imported, failed)
+
+    logger.info("%s trails imported, %s files rejected", imported, failed)
+
+
+def _insert_batch(batch, imported, failed):
+    # Un lot refusé par la base est annulé seul : l'import continue avec les suivants
+    try:
+        return imported + _insert_trails(batch), failed
+    except DBAPIError as e:
+        logger.error("Batch of %s trails rejected by the database: %s", len(batch), e.orig)
+        for result in batch:
+            logger.error("Not imported: %s", result['path'])
+        return imported, failed + len(batch)
+
+
+def _insert_trails(batch):
+    rows = [result["row"] for result in batch]
+
+    # Un seul INSERT multi-lignes par lot, dans une transaction
+    with Session() as session:
+        trail_ids = session.scalars(
+            insert(Trail).returning(Trail.id, sort_by_parameter_order=True),
+            rows
+        ).all()
+        session.commit()
+
+    for result, trail_id in zip(batch, trail_ids):
+        click.echo(f"{trail_id}\t{result['path']}")
+    return len(trail_ids)
+
+
+@reviews_cli.command("rebuild-stats")
+def rebuild_review_stats():
+    """Recalcule entièrement les agrégats des avis validés par randonnée."""
+    with Session() as session:
+        session.execute(text("DELETE FROM hike_review_stats"))
+        session.execute(text(REBUILD_REVIEW_STATS))
+        session.commit()
+    logger.info("Review stats rebuilt")
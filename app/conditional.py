@@ -0,0 +1,43 @@
+import hashlib
+from functools import wraps
+from flask import request, make_response
+from app.cache import ResponseCache
+from app.services.version_service import get_version
+
+
+def conditional(*models):
+    # Répond 304 sans exécuter la vue si la version des tables n'a pas changé.
+    # À placer sous @cache.cached : l'ETag est stocké avec l'entrée de cache, un hit
+    # est revalidé sans requête SQL et les deux sont invalidés par les mêmes tags
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method != "GET":
+                return f(*args, **kwargs)
+
+            version, last_modified = get_version(*models)
+            etag = hashlib.md5(f"{ResponseCache.make_key()}|{version}".encode()).hexdigest()
+
+            if _is_not_modified(etag, last_modified):
+                response = make_response("", 304)
+                response.set_etag(etag)
+                return response
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                if last_modified:
+                    response.last_modified = last_modified
+            return response
+
+        return decorated_function
+
+    return decorator
+
+
+def _is_not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
@@ -6,3 +6,23 @@ config = dotenv_values(f"./conf/{env}.env")
 
 if not config:
     raise RuntimeError(f"Could not load config for env: {env}")
+
+# Les variables d'environnement surchargent les clés définies dans le fichier
+config.update({key: os.environ[key] for key in config if key in os.environ})
+
+
+def config_int(key, default):
+    value = config.get(key)
+    return int(value) if value not in (None, "") else default
+
+
+def config_float(key, default):
+    value = config.get(key)
+    return float(value) if value not in (None, "") else default
+
+
+def config_bool(key, default):
+    value = config.get(key)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
@@ -0,0 +1,48 @@
+from flask import Blueprint, jsonify, request
+from app.services import hike_service, review_service
+from app.auth import verify_firebase_token_and_role, get_user_id
+from app.logger import logger
+
+batch_bp = Blueprint('batch_bp', __name__, url_prefix='/api')
+
+# Nombre maximal d'éléments par requête groupée
+MAX_BATCH_SIZE = 500
+
+
+def get_batch_items():
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        raise ValueError("Expected a JSON array")
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"Batch is limited to {MAX_BATCH_SIZE} items")
+    return items
+
+
+@batch_bp.route('/hikes:batch', methods=['POST'])
+@verify_firebase_token_and_role
+def save_hikes():
+    try:
+        items = get_batch_items()
+    except ValueError as e:
+        logger.warning("Invalid batch request: %s", e)
+        return jsonify({"error": str(e)}), 400
+    logger.info("POST request to save %s hikes by user %s", len(items), get_user_id())
+    results = hike_service.save_hikes(items)
+    failed = sum(1 for result in results if result["status"] >= 400)
+    logger.info("Hike batch saved: %s succeeded, %s failed", len(results) - failed, failed)
+    return jsonify({"results": results}), 200
+
+
+@batch_bp.route('/reviews:batch', methods=['PATCH'])
+@verify_firebase_token_and_role
+def moderate_reviews():
+    try:
+        items = get_batch_items()
+    except ValueError as e:
+        logger.warning("Invalid batch request: %s", e)
+        return jsonify({"error": str(e)}), 400
+    logger.info("PATCH request to moderate %s reviews by user %s", len(items), get_user_id())
+    results = review_service.moderate_reviews(items)
+    failed = sum(1 for result in results if result["status"] >= 400)
+    logger.info("Review batch moderated: %s succeeded, %s failed", len(results) - failed, failed)
+    return jsonify({"results": results}), 200
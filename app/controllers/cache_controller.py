@@ -0,0 +1,11 @@
+from flask import Blueprint, jsonify
+from app.cache import cache
+from app.auth import verify_firebase_token_and_role
+
+cache_bp = Blueprint('cache_bp', __name__, url_prefix='/api/cache')
+
+
+@cache_bp.route('/stats')
+@verify_firebase_token_and_role
+def get_cache_stats():
+    return jsonify(cache.stats()), 200
@@ -1,6 +1,10 @@
 from flask import Blueprint, jsonify
 from app.services import data_service
+from app.cache import cache
+from app.conditional import conditional
+from app.models import Zone, Region, Journey
 from app.logger import logger
+from app.pagination import get_page_args, get_fields, page_response
 
 region_bp = Blueprint('region_bp', __name__, url_prefix='/api/regions')
 journey_bp = Blueprint('journey_bp', __name__, url_prefix='/api/journeys')
@@ -8,28 +12,44 @@ zone_bp = Blueprint('zone_bp', __name__, url_prefix='/api/zones')
 
 
 @zone_bp.route('/<int:zone_id>')
+@cache.cached(tags=("zones",))
+@conditional(Zone)
 def get_zone(zone_id):
-    logger.info(f"GET request for zone with ID {zone_id}")
+    logger.info("GET request for zone with ID %s", zone_id)
     zone = data_service.get_zone_by_id(zone_id)
     if not zone:
-        logger.warning(f"Zone with ID {zone_id} not found")
+        logger.warning("Zone with ID %s not found", zone_id)
         return jsonify({'error': 'Zone not found'}), 404
-    logger.info(f"Zone with ID {zone_id} found")
+    logger.info("Zone with ID %s found", zone_id)
     return zone, 200
 
 
 @region_bp.route('')
+@cache.cached(tags=("regions",))
+@conditional(Region)
 def get_regions():
-    logger.info(f"GET request for regions")
-    regions = data_service.get_regions()
-    return jsonify(regions), 200
+    logger.info("GET request for regions")
+    try:
+        limit, after = get_page_args()
+    except ValueError as e:
+        logger.warning("Invalid query parameters: %s", e)
+        return jsonify({"error": str(e)}), 400
+    regions = data_service.get_regions(limit=limit, after=after)
+    return page_response(regions, limit, get_fields()), 200
 
 
 @journey_bp.route('')
+@cache.cached(tags=("journeys",))
+@conditional(Journey)
 def get_journeys():
-    logger.info(f"GET request for journeys")
-    journeys = data_service.get_journeys()
-    return jsonify(journeys), 200
+    logger.info("GET request for journeys")
+    try:
+        limit, after = get_page_args()
+    except ValueError as e:
+        logger.warning("Invalid query parameters: %s", e)
+        return jsonify({"error": str(e)}), 400
+    journeys = data_service.get_journeys(limit=limit, after=after)
+    return page_response(journeys, limit, get_fields()), 200
 
 
 
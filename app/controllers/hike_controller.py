@@ -1,46 +1,125 @@
-from flask import Blueprint, jsonify, request
-from app.services import hike_service
+from flask import Blueprint, jsonify, request, Response
+from app.services import hike_service, review_service
 from app.auth import verify_firebase_token_and_role, get_user_role, get_user_id
 from app.limiter import limiter
+from app.cache import cache
+from app.conditional import conditional
+from app.models import Hike, Trail, ReviewStats
 from app.logger import logger
+from app.trail_tiers import select_tier
+from app.trail_encoding import FORMATS, PROTOBUF_MIMETYPE, to_polyline, to_delta, to_protobuf
+from app.spatial import parse_spatial_filters
+from app.pagination import get_page_args, get_fields, page_response
+from app.streaming import wants_ndjson, ndjson_response
 
 hike_bp = Blueprint('hike_bp', __name__, url_prefix='/api/hikes')
 
 
+def get_requested_tier():
+    # ?zoom=<niveau de zoom carto> ou ?tolerance=<degrés>
+    zoom = request.args.get("zoom", type=int)
+    tolerance = request.args.get("tolerance", type=float)
+    return select_tier(zoom=zoom, tolerance=tolerance)
+
+
+def get_requested_format():
+    # ?format=<geojson|polyline|delta|protobuf> ou Accept: application/x-protobuf
+    if "format" in request.args:
+        return request.args["format"]
+    if request.accept_mimetypes.best == PROTOBUF_MIMETYPE:
+        return "protobuf"
+    return "geojson"
+
+
 @hike_bp.route('/<int:hike_id>')
+@cache.cached(tags=("hikes",))
+@conditional(Hike, Trail)
 def get_hike(hike_id):
-    logger.info(f"GET request for hike with ID {hike_id}")
-    hike = hike_service.get_hike_by_id(hike_id)
+    logger.info("GET request for hike with ID %s", hike_id)
+    hike = hike_service.get_hike_by_id(hike_id, tier=get_requested_tier())
     if not hike:
-        logger.warning(f"Hike with ID {hike_id} not found")
+        logger.warning("Hike with ID %s not found", hike_id)
         return jsonify({'error': 'Hike not found'}), 404
-    logger.info(f"Hike with ID {hike_id} found")
+    logger.info("Hike with ID %s found", hike_id)
     return hike, 200
 
 
+@hike_bp.route('/<int:hike_id>/trail')
+@cache.cached(tags=("hikes",), vary=("Accept",))
+@conditional(Hike, Trail)
+def get_hike_trail(hike_id):
+    logger.info("GET request for trail of hike with ID %s", hike_id)
+    trail_format = get_requested_format()
+    if trail_format not in FORMATS:
+        logger.warning("Unsupported trail format %s", trail_format)
+        return jsonify({'error': f"Unsupported format, expected one of {', '.join(FORMATS)}"}), 400
+
+    if trail_format == "geojson":
+        trail = hike_service.get_hike_trail(hike_id, tier=get_requested_tier())
+        if not trail:
+            logger.warning("Trail for hike with ID %s not found", hike_id)
+            return jsonify({'error': 'Trail not found'}), 404
+        return trail, 200
+
+    trail = hike_service.get_hike_trail_coordinates(hike_id, tier=get_requested_tier())
+    if not trail or trail[1] is None:
+        logger.warning("Trail for hike with ID %s not found", hike_id)
+        return jsonify({'error': 'Trail not found'}), 404
+    trail_id, coordinates = trail
+    if trail_format == "protobuf":
+        return Response(to_protobuf(trail_id, coordinates), mimetype=PROTOBUF_MIMETYPE), 200
+    if trail_format == "polyline":
+        return jsonify(to_polyline(trail_id, coordinates)), 200
+    return jsonify(to_delta(trail_id, coordinates)), 200
+
+
+@hike_bp.route('/<int:hike_id>/reviews/stats')
+@cache.cached(tags=("reviews",))
+@conditional(ReviewStats)
+def get_hike_review_stats(hike_id):
+    logger.info("GET request for review stats of hike with ID %s", hike_id)
+    stats = review_service.get_review_stats(hike_id)
+    if stats is None:
+        logger.warning("Hike with ID %s not found", hike_id)
+        return jsonify({'error': 'Hike not found'}), 404
+    return stats, 200
+
+
 @hike_bp.route('')
 @limiter.limit(lambda: "100/minute" if get_user_role() == "admin" else "5/minute")
+@cache.cached(tags=("hikes",), vary=("Accept",))
+@conditional(Hike, Trail, ReviewStats)
 def get_hikes():
     filters = {}
     zone_id = request.args.get("zone_id")
-    logger.info(f"GET request for hikes in zone {zone_id}")
+    logger.info("GET request for hikes in zone %s", zone_id)
     if zone_id:
-        filters["difficulty"] = zone_id
-    hikes = hike_service.get_hikes(filters=filters)
-    logger.info(f"{len(hikes)} hikes retrieved")
-    return jsonify(hikes), 200
+        filters["zone_id"] = zone_id
+    try:
+        filters.update(parse_spatial_filters(request.args))
+        limit, after = get_page_args()
+    except ValueError as e:
+        logger.warning("Invalid query parameters: %s", e)
+        return jsonify({"error": str(e)}), 400
+    fields = get_fields()
+    if wants_ndjson():
+        logger.info("Streaming hikes as NDJSON")
+        return ndjson_response(hike_service.iter_hikes(filters=filters, limit=limit, after=after, fields=fields), fields)
+    hikes = hike_service.get_hikes(filters=filters, limit=limit, after=after, fields=fields)
+    logger.info("%s hikes retrieved", len(hikes))
+    return page_response(hikes, limit, fields), 200
 
 
 @hike_bp.route('/<int:hike_id>', methods=['PUT'])
 @verify_firebase_token_and_role
 def update_hike(hike_id):
     data = request.get_json()
-    logger.info(f"PUT request to update hike with ID {hike_id} by user {get_user_id()}")
+    logger.info("PUT request to update hike with ID %s by user %s", hike_id, get_user_id())
     updated = hike_service.update_hike(hike_id, data)
     if updated is None:
-        logger.warning(f"Hike with ID {hike_id} not found")
+        logger.warning("Hike with ID %s not found", hike_id)
         return jsonify({"error": "Hike not found"}), 404
-    logger.info(f"Successfully updated hike with ID {hike_id}")
+    logger.info("Successfully updated hike with ID %s", hike_id)
     return updated, 200
 
 
@@ -48,26 +127,26 @@ def update_hike(hike_id):
 @verify_firebase_token_and_role
 def create_hike():
     data = request.get_json()
-    logger.info(f"POST request to create with data {data} hike by user {get_user_id()}")
+    logger.info("POST request to create hike by user %s", get_user_id())
     try:
         hike = hike_service.create_hike(data)
-        logger.info(f"Successfully created hike with ID {hike['id']}")
+        logger.info("Successfully created hike with ID %s", hike['id'])
         return hike, 201
     except Exception as e:
-        logger.error(f"Failed to create hike: {str(e)}")
+        logger.error("Failed to create hike: %s", e)
         return jsonify({"error": str(e)}), 400
 
 
 @hike_bp.route('/<int:hike_id>', methods=['DELETE'])
 @verify_firebase_token_and_role
 def delete_hike(hike_id):
-    logger.info(f"DELETE request to delete hike with ID {hike_id} by user {get_user_id()}")
+    logger.info("DELETE request to delete hike with ID %s by user %s", hike_id, get_user_id())
     try:
         hike_service.delete_hike(hike_id)
-        logger.info(f"Successfully deleted hike with ID {hike_id}")
+        logger.info("Successfully deleted hike with ID %s", hike_id)
         return '', 204
     except Exception as e:
-        logger.error(f"Failed to delete hike: {str(e)}")
+        logger.error("Failed to delete hike: %s", e)
         return jsonify({"error": str(e)}), 400
 
 
@@ -0,0 +1,28 @@
+import hmac
+from flask import Blueprint, Response, jsonify, request
+from app.cache import cache
+from app.config import config, env
+from app.database import pool_stats
+from app.limiter import limiter
+from app.metrics import render_prometheus
+
+metrics_bp = Blueprint('metrics_bp', __name__)
+
+PROMETHEUS_MIMETYPE = "text/plain; version=0.0.4"
+
+
+@metrics_bp.route('/metrics')
+@limiter.exempt
+def get_metrics():
+    # Jeton statique (le scraper Prometheus n'a pas de jeton Firebase). Sans jeton
+    # configuré, l'endpoint n'est ouvert qu'en dev
+    token = config.get("METRICS_TOKEN")
+    if not token:
+        if env != "dev":
+            return jsonify({"error": "Not found"}), 404
+    elif not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    cache_stats = {f"response_cache_{key}": value for key, value in cache.stats().items()}
+    db_pool = {f"db_pool_{key}": value for key, value in pool_stats().items()}
+    return Response(render_prometheus(cache_stats, db_pool), mimetype=PROMETHEUS_MIMETYPE)
@@ -1,33 +1,48 @@
 from flask import Blueprint, jsonify, request
 from app.services import review_service
 from app.auth import verify_firebase_token_and_role, get_user_id
+from app.cache import cache
+from app.conditional import conditional
+from app.models import Review
 from app.logger import logger
+from app.pagination import get_page_args, get_fields, page_response
+from app.streaming import wants_ndjson, ndjson_response
 
 review_bp = Blueprint('review_bp', __name__, url_prefix='/api/reviews')
 
 
 @review_bp.route('')
+@cache.cached(tags=("reviews",), vary=("Accept",))
+@conditional(Review)
 def get_reviews():
     filters = {}
     hike_id = request.args.get("hike_id")
-    logger.info(f"GET request for reviews with hike {hike_id}")
+    logger.info("GET request for reviews with hike %s", hike_id)
     if hike_id:
         filters["hike_id"] = hike_id
-    reviews = review_service.get_reviews(filters=filters)
-    logger.info(f"{len(reviews)} reviews retrieved")
-    return jsonify(reviews), 200
+    try:
+        limit, after = get_page_args()
+    except ValueError as e:
+        logger.warning("Invalid query parameters: %s", e)
+        return jsonify({"error": str(e)}), 400
+    if wants_ndjson():
+        logger.info("Streaming reviews as NDJSON")
+        return ndjson_response(review_service.iter_reviews(filters=filters, limit=limit, after=after), get_fields())
+    reviews = review_service.get_reviews(filters=filters, limit=limit, after=after)
+    logger.info("%s reviews retrieved", len(reviews))
+    return page_response(reviews, limit, get_fields()), 200
 
 
 @review_bp.route('/<int:review_id>', methods=['PUT'])
 @verify_firebase_token_and_role
 def update_review(review_id):
     data = request.get_json()
-    logger.info(f"PUT request to update review with ID {review_id} by user {get_user_id()}")
+    logger.info("PUT request to update review with ID %s by user %s", review_id, get_user_id())
     updated = review_service.update_review(review_id, data)
     if updated is None:
-        logger.warning(f"Review with ID {review_id} not found")
+        logger.warning("Review with ID %s not found", review_id)
         return jsonify({"error": "Review not found"}), 404
-    logger.info(f"Successfully updated review with ID {review_id}")
+    logger.info("Successfully updated review with ID %s", review_id)
     return updated, 200
 
 
@@ -35,24 +50,24 @@ def update_review(review_id):
 @verify_firebase_token_and_role
 def create_review():
     data = request.get_json()
-    logger.info(f"POST request to create review with data {data} by user {get_user_id()}")
+    logger.info("POST request to create review by user %s", get_user_id())
     try:
         review = review_service.create_review(data)
-        logger.info(f"Successfully created review with ID {review['id']}")
+        logger.info("Successfully created review with ID %s", review['id'])
         return review, 201
     except Exception as e:
-        logger.error(f"Failed to create review: {str(e)}")
+        logger.error("Failed to create review: %s", e)
         return jsonify({"error": str(e)}), 400
 
 
 @review_bp.route('/<int:review_id>', methods=['DELETE'])
 @verify_firebase_token_and_role
 def delete_review(review_id):
-    logger.info(f"DELETE request to delete review with ID {review_id} by user {get_user_id()}")
+    logger.info("DELETE request to delete review with ID %s by user %s", review_id, get_user_id())
     try:
         review_service.delete_review(review_id)
-        logger.info(f"Successfully deleted review with ID {review_id}")
+        logger.info("Successfully deleted review with ID %s", review_id)
         return '', 204
     except Exception as e:
-        logger.error(f"Failed to delete review: {str(e)}")
+        logger.error("Failed to delete review: %s", e)
         return jsonify({"error": str(e)}), 400
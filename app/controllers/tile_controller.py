@@ -0,0 +1,22 @@
+from flask import Blueprint, jsonify, request, Response
+from app.services import tile_service
+from app.limiter import limiter
+from app.logger import logger
+
+tile_bp = Blueprint('tile_bp', __name__, url_prefix='/api/tiles')
+
+
+@tile_bp.route('/<int:z>/<int:x>/<int:y>.mvt')
+@limiter.limit("300/minute")
+def get_tile(z, x, y):
+    logger.debug("GET request for tile %s/%s/%s", z, x, y)
+    if not tile_service.is_valid_tile(z, x, y):
+        logger.warning("Invalid tile coordinates %s/%s/%s", z, x, y)
+        return jsonify({'error': 'Invalid tile coordinates'}), 400
+
+    tile, etag = tile_service.get_tile(z, x, y)
+    response = Response(tile, mimetype="application/vnd.mapbox-vector-tile")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = tile_service.TILE_CACHE_TTL
+    return response.make_conditional(request)
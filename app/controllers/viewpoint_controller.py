@@ -1,20 +1,33 @@
 from flask import Blueprint, jsonify, request
 from app.services import viewpoint_service
+from app.cache import cache
+from app.conditional import conditional
+from app.models import Viewpoint
 from app.logger import logger
+from app.spatial import parse_spatial_filters
+from app.pagination import get_page_args, get_fields, page_response
 
 viewpoint_bp = Blueprint('viewpoint_bp', __name__, url_prefix='/api/viewpoints')
 
 
 @viewpoint_bp.route('')
+@cache.cached(tags=("viewpoints",))
+@conditional(Viewpoint)
 def get_viewpoints():
     filters = {}
     hike_id = request.args.get("hike_id")
-    logger.info(f"GET request for viewpoints with hike {hike_id}")
+    logger.info("GET request for viewpoints with hike %s", hike_id)
     if hike_id:
         filters["hike_id"] = hike_id
-    viewpoints = viewpoint_service.get_viewpoints(filters=filters)
-    logger.info(f"{len(viewpoints)} viewpoints retrieved")
-    return jsonify(viewpoints), 200
+    try:
+        filters.update(parse_spatial_filters(request.args))
+        limit, after = get_page_args()
+    except ValueError as e:
+        logger.warning("Invalid query parameters: %s", e)
+        return jsonify({"error": str(e)}), 400
+    viewpoints = viewpoint_service.get_viewpoints(filters=filters, limit=limit, after=after)
+    logger.info("%s viewpoints retrieved", len(viewpoints))
+    return page_response(viewpoints, limit, get_fields()), 200
 
 
 
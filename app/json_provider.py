@@ -0,0 +1,59 @@
+import numpy as np
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+from app.config import config
+from app.metrics import timed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(o):
+    # Tableaux NumPy (coordonnées des tracés) : sérialisés sans conversion préalable en listes
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    if isinstance(o, np.generic):
+        return o.item()
+    return DefaultJSONProvider.default(o)
+
+
+class NumpyJSONProvider(DefaultJSONProvider):
+    default = staticmethod(_default)
+
+    def response(self, *args, **kwargs):
+        with timed("json"):
+            return super().response(*args, **kwargs)
+
+
+class OrjsonProvider(JSONProvider):
+    sort_keys = True
+    mimetype = "application/json"
+
+    def _options(self):
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps_bytes(self, obj):
+        return orjson.dumps(obj, default=_default, option=self._options())
+
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        with timed("json"):
+            body = self.dumps_bytes(obj)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+def get_json_provider_class():
+    provider = config.get("JSON_PROVIDER", "orjson")
+    if provider == "orjson" and orjson is not None:
+        return OrjsonProvider
+    return NumpyJSONProvider
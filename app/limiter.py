@@ -1,21 +1,34 @@
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from flask import request
-from firebase_admin import auth
+from app.auth import get_decoded_token
+from app.config import config, config_int, config_float
+# Enregistre le schéma postgresql+batched:// auprès de limits
+from app.limiter_storage import BatchedPostgresStorage
 
 
 def get_rate_limit_key():
     try:
-        authorization = request.headers.get("Authorization")
-        if authorization and authorization.startswith("Bearer "):
-            token = authorization.split("Bearer ")[1]
-            decoded_token = auth.verify_id_token(token)
+        decoded_token = get_decoded_token()
+        if decoded_token:
             return decoded_token.get("uid", get_remote_address())
     except Exception:
         pass
     return get_remote_address()
 
 
+def init_storage(app):
+    # Stockage partagé entre workers (memory:// par défaut : compteurs propres à chaque worker)
+    storage_uri = config.get("RATELIMIT_STORAGE_URI") or "memory://"
+    app.config["RATELIMIT_STORAGE_URI"] = storage_uri
+    if storage_uri.split("://")[0] in BatchedPostgresStorage.STORAGE_SCHEME:
+        app.config["RATELIMIT_STORAGE_OPTIONS"] = {
+            "flush_interval": config_float("RATELIMIT_FLUSH_INTERVAL", 1.0),
+            "batch_size": config_int("RATELIMIT_BATCH_SIZE", 5),
+        }
+    # Stockage partagé indisponible : repli temporaire sur des compteurs en mémoire
+    app.config["RATELIMIT_IN_MEMORY_FALLBACK_ENABLED"] = not storage_uri.startswith("memory://")
+
+
 # Initialisation du limiter
 limiter = Limiter(
     key_func=get_rate_limit_key,
@@ -0,0 +1,141 @@
+import threading
+import time
+from limits.storage import Storage
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from app.logger import logger
+
+# Incrément groupé : la fenêtre repart de zéro si elle a expiré
+UPSERT_COUNTER = text("""
+    INSERT INTO rate_limits (key, count, expires_at)
+    VALUES (:key, :amount, now() + make_interval(secs => :expiry))
+    ON CONFLICT (key) DO UPDATE SET
+        count = CASE WHEN rate_limits.expires_at <= now() THEN excluded.count
+                     ELSE rate_limits.count + excluded.count END,
+        expires_at = CASE WHEN rate_limits.expires_at <= now() THEN excluded.expires_at
+                          ELSE rate_limits.expires_at END
+    RETURNING count, extract(epoch FROM expires_at)
+""")
+
+SELECT_COUNTER = text("""
+    SELECT count, extract(epoch FROM expires_at) FROM rate_limits
+    WHERE key = :key AND expires_at > now()
+""")
+
+# Ménage des fenêtres expirées (table et compteurs locaux), au plus une fois par CLEANUP_INTERVAL secondes
+CLEANUP_INTERVAL = 300
+DELETE_EXPIRED = text("DELETE FROM rate_limits WHERE expires_at <= now()")
+
+
+class BatchedPostgresStorage(Storage):
+    # Compteurs de fenêtre fixe partagés entre workers dans PostgreSQL (table rate_limits).
+    # Chaque worker agrège ses incréments localement et ne les envoie qu'au premier hit
+    # d'une clé, tous les `batch_size` hits ou toutes les `flush_interval` secondes :
+    # les hits des autres workers sont vus avec au plus ce retard.
+
+    STORAGE_SCHEME = ["postgresql+batched"]
+
+    def __init__(self, uri=None, wrap_exceptions=False, flush_interval=1.0, batch_size=5, **options):
+        self.flush_interval = float(flush_interval)
+        self.batch_size = int(batch_size)
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.last_cleanup = 0.0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return SQLAlchemyError
+
+    @staticmethod
+    def _engine():
+        # Import local : le moteur est créé à la demande (cf. app.database.get_engine)
+        from app.database import get_engine
+        return get_engine()
+
+    def incr(self, key, expiry, amount=1):
+        now = time.time()
+        with self.lock:
+            counter = self.counters.get(key)
+            if counter is not None and counter["expires_at"] <= now:
+                counter = None
+            if counter is None:
+                counter = self.counters[key] = {"shared": 0, "pending": 0, "expires_at": now + expiry, "synced_at": 0.0}
+            counter["pending"] += amount
+            flush = (
+                counter["synced_at"] == 0.0
+                or counter["pending"] >= self.batch_size
+                or now - counter["synced_at"] >= self.flush_interval
+            )
+            if not flush:
+                return counter["shared"] + counter["pending"]
+            pending = counter["pending"]
+            counter["pending"] = 0
+            counter["synced_at"] = now
+
+        try:
+            with self._engine().begin() as connection:
+                shared, expires_at = connection.execute(
+                    UPSERT_COUNTER, {"key": key, "amount": pending, "expiry": expiry}
+                ).one()
+                if now - self.last_cleanup >= CLEANUP_INTERVAL:
+                    self.last_cleanup = now
+                    connection.execute(DELETE_EXPIRED)
+                    self._prune(now)
+        except SQLAlchemyError:
+            with self.lock:
+                counter["pending"] += pending
+            raise
+
+        with self.lock:
+            counter["shared"] = shared
+            counter["expires_at"] = float(expires_at)
+            return counter["shared"] + counter["pending"]
+
+    def _prune(self, now):
+        # Fenêtres locales expirées (une entrée par limite et par clé IP / uid)
+        with self.lock:
+            expired = [key for key, counter in self.counters.items() if counter["expires_at"] <= now]
+            for key in expired:
+                del self.counters[key]
+
+    def get(self, key):
+        with self.lock:
+            counter = self.counters.get(key)
+            if counter is not None and counter["expires_at"] > time.time():
+                return counter["shared"] + counter["pending"]
+        row = self._select(key)
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        with self.lock:
+            counter = self.counters.get(key)
+            if counter is not None and counter["expires_at"] > time.time():
+                return counter["expires_at"]
+        row = self._select(key)
+        return float(row[1]) if row else time.time()
+
+    def _select(self, key):
+        with self._engine().connect() as connection:
+            return connection.execute(SELECT_COUNTER, {"key": key}).first()
+
+    def check(self):
+        try:
+            with self._engine().connect() as connection:
+                connection.execute(text("SELECT 1"))
+            return True
+        except SQLAlchemyError as e:
+            logger.warning("Rate limit storage unavailable: %s", e)
+            return False
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+        with self._engine().begin() as connection:
+            return connection.execute(text("DELETE FROM rate_limits")).rowcount
+
+    def clear(self, key):
+        with self.lock:
+            self.counters.pop(key, None)
+        with self._engine().begin() as connection:
+            connection.execute(text("DELETE FROM rate_limits WHERE key = :key"), {"key": key})
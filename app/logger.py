@@ -1,7 +1,17 @@
+import atexit
+import copy
+import json
 import logging
-from colorlog import ColoredFormatter
+import os
+import queue
+import random
+import re
 import sys
-from app.config import env
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+from colorlog import ColoredFormatter
+from flask import g, has_request_context, request
+from app.config import env, config, config_float
 
 # Crée un logger
 logger = logging.getLogger("kavale_api")
@@ -9,30 +19,151 @@ logger = logging.getLogger("kavale_api")
 # Choix du niveau selon l'env
 logger.setLevel(logging.DEBUG if env == "dev" else logging.INFO)
 
-# Handler console
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setLevel(logging.DEBUG)
+# Identifiant de corrélation, repris du client / load balancer s'il est valide
+REQUEST_ID_HEADER = "X-Request-ID"
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+# Échantillonnage des lignes INFO / DEBUG : taux global et taux par route
+# (LOG_SAMPLE_ROUTES="/api/hikes=0.1,/api/tiles/<int:z>/<int:x>/<int:y>.mvt=0.01")
+LOG_SAMPLE_RATE = config_float("LOG_SAMPLE_RATE", 1.0)
 
 # ANSI pour gras et italique
 BOLD = '\033[1m'
 ITALIC = '\033[3m'
 RESET = '\033[0m'
 
-# format coloré pour le terminal
-formatter = ColoredFormatter(
-    f"%(log_color)s{BOLD}[%(asctime)s]%(reset)s %(log_color)s%(levelname)s in %(name)s: {ITALIC}%(message)s{RESET}",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    log_colors={
-        'DEBUG':    'cyan',
-        'INFO':     'green',
-        'WARNING':  'yellow',
-        'ERROR':    'red',
-        'CRITICAL': 'bold_red',
-    },
-    reset=True
-)
-
-console_handler.setFormatter(formatter)
-
-# Ajoute le handler au logger
-logger.addHandler(console_handler)
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_exception_formatter = logging.Formatter()
+
+
+def _parse_sample_routes(value):
+    routes = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            rule, rate = item.rsplit("=", 1)
+            routes[rule.strip()] = float(rate)
+    return routes
+
+
+LOG_SAMPLE_ROUTES = _parse_sample_routes(config.get("LOG_SAMPLE_ROUTES"))
+
+
+class JsonFormatter(logging.Formatter):
+    # Une ligne JSON par entrée (severity / message reconnus par Cloud Logging)
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, DATE_FORMAT),
+            "severity": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RequestContextFilter(logging.Filter):
+    # Ajoute request_id et échantillonne les lignes INFO / DEBUG par requête
+
+    def filter(self, record):
+        if not has_request_context():
+            record.request_id = "-"
+            return True
+        record.request_id = g.get("request_id", "-")
+        if record.levelno > logging.INFO:
+            return True
+        return _is_sampled()
+
+
+class DeferredQueueHandler(QueueHandler):
+    # Comme QueueHandler, le message est interpolé côté requête (arguments figés à
+    # l'instant du log, pas d'objet ORM évalué hors de sa session) et la traceback
+    # mise en texte ; seul le rendu final (JSON / couleurs) est laissé au thread d'écriture
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _is_sampled():
+    # Décision prise une fois par requête : ses lignes sont gardées ou écartées ensemble
+    sampled = g.get("log_sampled")
+    if sampled is None:
+        rule = request.url_rule.rule if request.url_rule else None
+        rate = LOG_SAMPLE_ROUTES.get(rule, LOG_SAMPLE_RATE)
+        sampled = g.log_sampled = rate >= 1 or random.random() < rate
+    return sampled
+
+
+def _make_formatter():
+    if config.get("LOG_FORMAT", "color" if env == "dev" else "json") == "json":
+        return JsonFormatter()
+    # format coloré pour le terminal
+    return ColoredFormatter(
+        f"%(log_color)s{BOLD}[%(asctime)s]%(reset)s %(log_color)s%(levelname)s in %(name)s "
+        f"(%(request_id)s): {ITALIC}%(message)s{RESET}",
+        datefmt=DATE_FORMAT,
+        log_colors={
+            'DEBUG':    'cyan',
+            'INFO':     'green',
+            'WARNING':  'yellow',
+            'ERROR':    'red',
+            'CRITICAL': 'bold_red',
+        },
+        reset=True
+    )
+
+
+# Handler console, alimenté par un thread dédié : les workers n'écrivent jamais sur stdout
+console_handler = logging.StreamHandler(sys.stdout)
+console_handler.setLevel(logging.DEBUG)
+console_handler.setFormatter(_make_formatter())
+
+queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+queue_handler.addFilter(RequestContextFilter())
+logger.addHandler(queue_handler)
+
+_listener = QueueListener(queue_handler.queue, console_handler, respect_handler_level=True)
+_listener.start()
+
+
+def _restart_listener():
+    # Après un fork (workers gunicorn), le thread d'écriture n'existe pas dans l'enfant
+    global _listener
+    queue_handler.queue = queue.SimpleQueue()
+    _listener = QueueListener(queue_handler.queue, console_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    # Vide la file avant la sortie du processus
+    _listener.stop()
+
+
+os.register_at_fork(after_in_child=_restart_listener)
+atexit.register(_stop_listener)
+
+
+def init_app(app):
+    app.before_request(_assign_request_id)
+    app.after_request(_send_request_id)
+
+
+def _assign_request_id():
+    request_id = request.headers.get(REQUEST_ID_HEADER, "")
+    g.request_id = request_id if REQUEST_ID_PATTERN.match(request_id) else uuid.uuid4().hex
+
+
+def _send_request_id(response):
+    if "request_id" in g:
+        response.headers[REQUEST_ID_HEADER] = g.request_id
+    return response
@@ -0,0 +1,189 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import config_int, config_bool
+from app.logger import logger
+
+# Bornes (ms) des histogrammes de latence
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+# Bornes du nombre de requêtes SQL par requête HTTP (détection des N+1)
+SQL_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+# Nombre de requêtes SQL au-delà duquel une requête HTTP est signalée
+SQL_QUERY_WARN = config_int("SQL_QUERY_WARN", 20)
+# Server-Timing expose le nombre et la durée des requêtes SQL : désactivé par défaut
+SERVER_TIMING = config_bool("SERVER_TIMING", False)
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            index = len(self.buckets)
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            yield f"{name}_bucket", {**labels, "le": str(bound)}, cumulative
+        yield f"{name}_sum", labels, round(self.sum, 3)
+        yield f"{name}_count", labels, self.count
+
+
+class RequestMetrics:
+    # Agrégats par endpoint, propres à chaque worker
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}
+        self.sql_count = {}
+        self.totals = {}
+
+    def record(self, endpoint, method, status, timings):
+        key = (endpoint, method)
+        with self.lock:
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(timings["total"])
+            self.sql_count.setdefault(key, Histogram(SQL_COUNT_BUCKETS)).observe(timings["sql_count"])
+            totals = self.totals.setdefault((endpoint, method, status), dict.fromkeys(
+                ("requests", "sql", "sql_count", "serialize", "json"), 0))
+            totals["requests"] += 1
+            for phase in ("sql", "sql_count", "serialize", "json"):
+                totals[phase] += timings[phase]
+
+    def samples(self):
+        samples = []
+        with self.lock:
+            for (endpoint, method), histogram in self.latency.items():
+                samples.extend(histogram.samples("http_request_duration_ms", {"endpoint": endpoint, "method": method}))
+            for (endpoint, method), histogram in self.sql_count.items():
+                samples.extend(histogram.samples("http_request_sql_queries", {"endpoint": endpoint, "method": method}))
+            for (endpoint, method, status), totals in self.totals.items():
+                labels = {"endpoint": endpoint, "method": method, "status": str(status)}
+                samples.extend((
+                    ("http_requests_total", labels, totals["requests"]),
+                    ("sql_queries_total", labels, totals["sql_count"]),
+                    ("sql_duration_ms_total", labels, round(totals["sql"], 3)),
+                    ("serialization_duration_ms_total", labels, round(totals["serialize"], 3)),
+                    ("json_encoding_duration_ms_total", labels, round(totals["json"], 3)),
+                ))
+        return samples
+
+
+request_metrics = RequestMetrics()
+
+
+def _timings():
+    if not has_request_context():
+        return None
+    return g.get("timings")
+
+
+@contextmanager
+def timed(phase):
+    timings = _timings()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] += (time.perf_counter() - start) * 1000
+
+
+def timed_serialization(method):
+    # to_dict / to_summary_dict : seul l'appel le plus externe est mesuré
+    # (les modèles imbriqués sont déjà compris dans son temps)
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        timings = _timings()
+        if timings is None or timings["_depth"]:
+            return method(*args, **kwargs)
+        timings["_depth"] += 1
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            timings["serialize"] += (time.perf_counter() - start) * 1000
+            timings["_depth"] -= 1
+    return wrapper
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["query_start"].pop()
+    timings = _timings()
+    if timings is not None:
+        timings["sql"] += (time.perf_counter() - start) * 1000
+        timings["sql_count"] += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    if context.connection is not None and context.connection.info.get("query_start"):
+        context.connection.info["query_start"].pop()
+
+
+def init_app(app):
+    app.before_request(_start_request)
+    app.after_request(_end_request)
+
+
+def _start_request():
+    g.timings = {"start": time.perf_counter(), "sql": 0.0, "sql_count": 0, "serialize": 0.0, "json": 0.0, "_depth": 0}
+
+
+def _end_request(response):
+    timings = g.pop("timings", None)
+    if timings is None:
+        return response
+    timings["total"] = (time.perf_counter() - timings["start"]) * 1000
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    request_metrics.record(endpoint, request.method, response.status_code, timings)
+
+    if timings["sql_count"] > SQL_QUERY_WARN:
+        logger.warning("%s SQL queries for %s %s", timings['sql_count'], request.method, request.path)
+    if SERVER_TIMING:
+        response.headers["Server-Timing"] = ", ".join((
+            f'db;dur={timings["sql"]:.2f};desc="{timings["sql_count"]} queries"',
+            f'serialize;dur={timings["serialize"]:.2f}',
+            f'json;dur={timings["json"]:.2f}',
+            f'total;dur={timings["total"]:.2f}',
+        ))
+    return response
+
+
+def render_prometheus(*extra):
+    # Format texte Prometheus ; `extra` : dictionnaires de jauges {nom: valeur}
+    lines = []
+    for name, labels, value in request_metrics.samples():
+        rendered = ",".join(f'{key}="{label}"' for key, label in labels.items())
+        lines.append(f"{name}{{{rendered}}} {value}")
+    for gauges in extra:
+        for name, value in gauges.items():
+            if isinstance(value, bool):
+                value = int(value)
+            if isinstance(value, (int, float)):
+                lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
@@ -5,6 +5,7 @@ from .data import Trail
 from .data import Region
 from .viewpoint import Viewpoint
 from .review import Review
+from .review import ReviewStats
 
 __all__ = [
     "Zone",
@@ -13,5 +14,6 @@ __all__ = [
     "Hike",
     "Viewpoint",
     "Region",
-    "Review"
+    "Review",
+    "ReviewStats"
 ]
@@ -1,28 +1,33 @@
-from sqlalchemy import String, Integer, Column
+from sqlalchemy import String, Integer, DateTime, Column, Float, Index, event, inspect, func
 from sqlalchemy.orm import relationship
 from geoalchemy2 import Geography
 from geoalchemy2.elements import WKBElement
 from geoalchemy2.shape import to_shape
 from shapely import get_coordinates
 from app.database import Base
+from app.models.point import point_from_row, point_to_dict
+from app.metrics import timed_serialization
+from app.trail_metrics import compute_trail_metrics
+from app.trail_tiers import TIERS, compute_trail_tiers
 
 
 class Zone(Base):
     __tablename__ = 'zones'
+    __table_args__ = (
+        Index('idx_zones_location', 'location', postgresql_using='gist'),
+    )
 
     id: int = Column(Integer, primary_key=True)
     name: str = Column(String)
-    location: WKBElement = Column(Geography(geometry_type="POINT", srid=4326))
+    location: WKBElement = Column(Geography(geometry_type="POINT", srid=4326, spatial_index=False))
 
     hikes = relationship('Hike', back_populates='zone')
 
+    @timed_serialization
     def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "lat": str(to_shape(self.location).x),
-            "lng": str(to_shape(self.location).y)
-        }
+        return point_to_dict(self)
+
+    from_row = staticmethod(point_from_row)
 
 
 class Journey(Base):
@@ -33,6 +38,7 @@ class Journey(Base):
 
     hikes = relationship('Hike', back_populates='journey')
 
+    @timed_serialization
     def to_dict(self):
         return {
             "id": self.id,
@@ -42,22 +48,96 @@ class Journey(Base):
 
 class Trail(Base):
     __tablename__ = 'trails'
+    __table_args__ = (
+        Index('idx_trails_gpx', 'gpx', postgresql_using='gist'),
+    )
 
     id: int = Column(Integer, primary_key=True)
-    gpx: WKBElement = Column(Geography(geometry_type="LINESTRING", srid=4326))
+    gpx: WKBElement = Column(Geography(geometry_type="LINESTRING", srid=4326, spatial_index=False))
+
+    # Versions simplifiées du tracé pour les zooms faibles (cf. app/trail_tiers.py)
+    gpx_low: WKBElement = Column(Geography(geometry_type="LINESTRING", srid=4326, spatial_index=False))
+    gpx_medium: WKBElement = Column(Geography(geometry_type="LINESTRING", srid=4326, spatial_index=False))
+
+    # Métriques dérivées du tracé, calculées à l'écriture (cf. refresh_metrics)
+    distance: float = Column(Float)
+    elevation_gain: float = Column(Float)
+    elevation_loss: float = Column(Float)
+    min_altitude: float = Column(Float)
+    max_altitude: float = Column(Float)
+    max_slope: float = Column(Float)
+    bbox_west: float = Column(Float)
+    bbox_south: float = Column(Float)
+    bbox_east: float = Column(Float)
+    bbox_north: float = Column(Float)
+    start_lng: float = Column(Float)
+    start_lat: float = Column(Float)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     hikes = relationship('Hike', back_populates='trail')
 
-    def to_dict(self):
-        geojson = self.define_geojson()
+    # Colonnes nécessaires à to_summary_dict
+    SUMMARY_COLUMNS = (
+        "id", "start_lng", "start_lat", "bbox_west", "bbox_south", "bbox_east", "bbox_north",
+        "elevation_loss", "min_altitude", "max_altitude", "max_slope",
+    )
+
+    @timed_serialization
+    def to_dict(self, tier=None):
+        geojson = self.define_geojson(tier)
         return {
             "id": self.id,
             "geojson": geojson
         }
 
-    def define_geojson(self):
-        if self.gpx:
-            coordinates = get_coordinates(to_shape(self.gpx), include_z=True).tolist()
+    @timed_serialization
+    def to_summary_dict(self):
+        return self.summary_from_row({column: getattr(self, column) for column in self.SUMMARY_COLUMNS})
+
+    @staticmethod
+    def summary_from_row(row, prefix=""):
+        # Même rendu que to_summary_dict à partir d'une ligne Core (colonnes éventuellement préfixées)
+        def value(column):
+            return row[prefix + column]
+
+        return {
+            "id": value("id"),
+            "start": [value("start_lng"), value("start_lat")] if value("start_lng") is not None else None,
+            "bbox": [value("bbox_west"), value("bbox_south"), value("bbox_east"), value("bbox_north")]
+            if value("bbox_west") is not None else None,
+            "elevation_loss": round(value("elevation_loss")) if value("elevation_loss") is not None else None,
+            "min_altitude": value("min_altitude"),
+            "max_altitude": value("max_altitude"),
+            "max_slope": round(value("max_slope"), 1) if value("max_slope") is not None else None,
+        }
+
+    def refresh_metrics(self):
+        for column, value in compute_trail_metrics(self.gpx).items():
+            setattr(self, column, value)
+
+    def refresh_tiers(self):
+        for column, value in compute_trail_tiers(self.gpx).items():
+            setattr(self, column, value)
+
+    def get_geometry(self, tier=None):
+        if tier:
+            geometry = getattr(self, TIERS[tier]["column"])
+            # Niveau pas encore calculé : on retombe sur le tracé complet
+            if geometry is not None:
+                return geometry
+        return self.gpx
+
+    def get_coordinates(self, tier=None):
+        geometry = self.get_geometry(tier)
+        if geometry is None:
+            return None
+        return get_coordinates(to_shape(geometry), include_z=True)
+
+    def define_geojson(self, tier=None):
+        # Tableau NumPy sérialisé directement par le fournisseur JSON de l'app
+        coordinates = self.get_coordinates(tier)
+        if coordinates is not None:
             geojson = {
                 "type": "FeatureCollection",
                 "features": [
@@ -89,6 +169,7 @@ class Region(Base):
 
     hikes = relationship('Hike', back_populates='region')
 
+    @timed_serialization
     def to_dict(self):
         return {
             "id": self.id,
@@ -96,9 +177,9 @@ class Region(Base):
         }
 
 
-
-
-
-
-
-
+@event.listens_for(Trail, "before_insert")
+@event.listens_for(Trail, "before_update")
+def _refresh_trail_metrics(mapper, connection, target):
+    if inspect(target).attrs.gpx.history.has_changes():
+        target.refresh_metrics()
+        target.refresh_tiers()
@@ -1,10 +1,10 @@
 import datetime as dt
-from sqlalchemy import String, Integer, Date, Column, ForeignKey, Float
+from sqlalchemy import String, Integer, Date, DateTime, Column, ForeignKey, Float, func
 from sqlalchemy.orm import relationship
-from geoalchemy2.shape import to_shape
-from shapely import get_coordinates
-from pyproj import Geod
 from app.database import Base
+from app.metrics import timed_serialization
+from app.models.data import Trail
+from app.models.review import ReviewStats
 
 
 class Hike(Base):
@@ -18,6 +18,7 @@ class Hike(Base):
     duration: int = Column(Integer)
     description: str = Column(String)
     created_at = Column(Date, default=dt.datetime.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     journey_id = Column(Integer, ForeignKey('journeys.id'), unique=False, nullable=False)
     journey = relationship("Journey", back_populates="hikes")
@@ -32,52 +33,80 @@ class Hike(Base):
     trail = relationship("Trail", back_populates="hikes")
 
     reviews = relationship('Review', back_populates='hike')
+    review_stats = relationship('ReviewStats', back_populates='hike', uselist=False,
+                                cascade="all, delete-orphan", passive_deletes=True)
 
     viewpoints = relationship('Viewpoint', back_populates='hike')
 
-    def to_dict(self):
-        if self.get_geojson_distance():
-            distance = round(self.get_geojson_distance() / 1000, 1)
-        else:
-            distance = round(self.distance, 1)
-
-        if self.get_geojson_elevation():
-            elevation = round(self.get_geojson_elevation())
-        else:
-            elevation = self.elevation
-
+    @timed_serialization
+    def to_dict(self, tier=None):
         return {
             "id": self.id,
             "name": self.name,
-            "distance": distance,
-            "elevation": elevation,
+            "distance": self.get_distance(),
+            "elevation": self.get_elevation(),
             "difficulty": self.difficulty,
             "duration": self.duration,
             "description": self.description,
             "journey": self.journey.to_dict(),
-            "trail": self.trail.to_dict() if self.trail else None,
+            "trail": self.trail.to_dict(tier) if self.trail else None,
             "region": self.region.to_dict(),
         }
 
-    def get_geojson_elevation(self):
-        if self.trail:
-            coordinates = get_coordinates(to_shape(self.trail.gpx), include_z=True).tolist()
-            total_elevation = 0
-            for x in range(0, len(coordinates) - 10, 10):
-                if (coordinates[x + 10][2]) > (coordinates[x][2]):
-                    step = coordinates[x + 10][2] - coordinates[x][2]
-                    total_elevation += step
-        else:
-            total_elevation = None
-        return total_elevation
-
-    def get_geojson_distance(self):
-        geodesic = Geod(ellps="WGS84")
-        if self.trail:
-            total_length = geodesic.geometry_length(to_shape(self.trail.gpx))
-        else:
-            total_length = None
-        return total_length
-
+    @timed_serialization
+    def to_summary_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "distance": self.get_distance(),
+            "elevation": self.get_elevation(),
+            "difficulty": self.difficulty,
+            "duration": self.duration,
+            "journey": self.journey.to_dict(),
+            "trail": self.trail.to_summary_dict() if self.trail else None,
+            "region": self.region.to_dict(),
+            "reviews": self.review_stats.to_summary_dict() if self.review_stats else ReviewStats.summary(None, None),
+        }
 
+    @classmethod
+    def summary_from_row(cls, row, fields=None):
+        # Même rendu que to_summary_dict à partir d'une ligne Core (cf. hike_service._summary_select) ;
+        # avec `fields`, seules ces clés sont rendues (la ligne ne porte que leurs colonnes)
+        return {
+            field: render(row) for field, render in SUMMARY_RENDERERS.items()
+            if fields is None or field in fields
+        }
 
+    def get_distance(self):
+        return self.distance_km(self.trail.distance if self.trail else None, self.distance)
+
+    def get_elevation(self):
+        return self.elevation_gain(self.trail.elevation_gain if self.trail else None, self.elevation)
+
+    @staticmethod
+    def distance_km(trail_distance, distance):
+        # Distance mesurée sur le tracé si disponible, sinon saisie manuelle
+        if trail_distance:
+            return round(trail_distance / 1000, 1)
+        return round(distance, 1)
+
+    @staticmethod
+    def elevation_gain(trail_elevation_gain, elevation):
+        if trail_elevation_gain:
+            return round(trail_elevation_gain)
+        return elevation
+
+
+# Rendu de chaque clé de la vue liste à partir des colonnes de hike_service._summary_select
+SUMMARY_RENDERERS = {
+    "id": lambda row: row["id"],
+    "name": lambda row: row["name"],
+    "distance": lambda row: Hike.distance_km(row["trail_distance"], row["distance"]),
+    "elevation": lambda row: Hike.elevation_gain(row["trail_elevation_gain"], row["elevation"]),
+    "difficulty": lambda row: row["difficulty"],
+    "duration": lambda row: row["duration"],
+    "journey": lambda row: {"id": row["journey_id"], "name": row["journey_name"]},
+    "trail": lambda row: Trail.summary_from_row(row, prefix="trail_") if row["trail_id"] is not None else None,
+    "region": lambda row: {"id": row["region_id"], "name": row["region_name"]},
+    "reviews": lambda row: ReviewStats.summary(row["reviews_count"], row["reviews_rate_sum"]),
+}
@@ -0,0 +1,17 @@
+from geoalchemy2.shape import to_shape
+
+
+def point_from_row(row):
+    # Rendu commun des entités ponctuelles (zones, points de vue) à partir d'une ligne Core.
+    # Clés historiques : "lat" porte x (longitude) et "lng" porte y
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "lat": str(row["x"]),
+        "lng": str(row["y"])
+    }
+
+
+def point_to_dict(entity):
+    point = to_shape(entity.location)
+    return point_from_row({"id": entity.id, "name": entity.name, "x": point.x, "y": point.y})
@@ -1,7 +1,8 @@
-from sqlalchemy import String, Integer, Date, Column, ForeignKey, Boolean
+from sqlalchemy import String, Integer, Date, DateTime, Column, ForeignKey, Boolean, func
 from sqlalchemy.orm import relationship
 import datetime as dt
 from app.database import Base
+from app.metrics import timed_serialization
 
 
 class Review(Base):
@@ -12,11 +13,13 @@ class Review(Base):
     note: str = Column(String)
     rate: int = Column(Integer)
     created_at = Column(Date, default=dt.datetime.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     is_validated = Column(Boolean)
 
     hike_id = Column(Integer, ForeignKey('hikes.id'), unique=False, nullable=False)
     hike = relationship("Hike", back_populates="reviews")
 
+    @timed_serialization
     def to_dict(self):
         return {
             "id": self.id,
@@ -26,3 +29,58 @@ class Review(Base):
             "created_at": self.created_at.strftime("%d/%m/%y"),
             "is_validated": self.is_validated
         }
+
+
+class ReviewStats(Base):
+    # Agrégats des avis validés d'une randonnée, maintenus par review_service
+    __tablename__ = 'hike_review_stats'
+
+    RATES = range(1, 6)
+
+    hike_id = Column(Integer, ForeignKey('hikes.id', ondelete='CASCADE'), primary_key=True)
+    count: int = Column(Integer, nullable=False, default=0)
+    rate_sum: int = Column(Integer, nullable=False, default=0)
+    rate_1: int = Column(Integer, nullable=False, default=0)
+    rate_2: int = Column(Integer, nullable=False, default=0)
+    rate_3: int = Column(Integer, nullable=False, default=0)
+    rate_4: int = Column(Integer, nullable=False, default=0)
+    rate_5: int = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    hike = relationship("Hike", back_populates="review_stats")
+
+    @timed_serialization
+    def to_dict(self):
+        return {
+            "hike_id": self.hike_id,
+            "count": self.count,
+            "average": self.get_average(),
+            "histogram": {str(rate): getattr(self, f"rate_{rate}") for rate in self.RATES},
+        }
+
+    @timed_serialization
+    def to_summary_dict(self):
+        return self.summary(self.count, self.rate_sum)
+
+    def get_average(self):
+        return self.average(self.count, self.rate_sum)
+
+    @staticmethod
+    def average(count, rate_sum):
+        return round(rate_sum / count, 2) if count else None
+
+    @classmethod
+    def summary(cls, count, rate_sum):
+        # Randonnée sans avis validé : pas de ligne d'agrégats
+        if count is None:
+            return {"count": 0, "average": None}
+        return {"count": count, "average": cls.average(count, rate_sum)}
+
+    @classmethod
+    def empty_dict(cls, hike_id):
+        return {
+            "hike_id": hike_id,
+            "count": 0,
+            "average": None,
+            "histogram": {str(rate): 0 for rate in cls.RATES},
+        }
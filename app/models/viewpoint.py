@@ -1,27 +1,30 @@
-from sqlalchemy import String, Integer, Date, Column, ForeignKey
+from sqlalchemy import String, Integer, Date, DateTime, Column, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 import datetime as dt
 from geoalchemy2 import Geography
 from geoalchemy2.elements import WKBElement
-from geoalchemy2.shape import to_shape
 from app.database import Base
+from app.models.point import point_from_row, point_to_dict
+from app.metrics import timed_serialization
 
 
 class Viewpoint(Base):
     __tablename__ = 'viewpoints'
+    __table_args__ = (
+        Index('idx_viewpoints_location', 'location', postgresql_using='gist'),
+    )
 
     id: int = Column(Integer, primary_key=True)
     name: str = Column(String)
     created_at = Column(Date, default=dt.datetime.now())
-    location: WKBElement = Column(Geography(geometry_type="POINT", srid=4326))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    location: WKBElement = Column(Geography(geometry_type="POINT", srid=4326, spatial_index=False))
 
     hike_id = Column(Integer, ForeignKey('hikes.id'), unique=False, nullable=False)
     hike = relationship("Hike", back_populates="viewpoints")
 
+    @timed_serialization
     def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "lat": str(to_shape(self.location).x),
-            "lng": str(to_shape(self.location).y)
-        }
+        return point_to_dict(self)
+
+    from_row = staticmethod(point_from_row)
@@ -0,0 +1,64 @@
+from flask import request, jsonify, url_for
+
+# Pagination par curseur (keyset) sur l'id : ?limit=<n>&after=<dernier id reçu>
+MAX_LIMIT = 500
+
+
+def get_page_args():
+    limit = _parse_int("limit", minimum=1)
+    if limit is not None and limit > MAX_LIMIT:
+        raise ValueError(f"limit must be at most {MAX_LIMIT}")
+    after = _parse_int("after", minimum=0)
+    return limit, after
+
+
+def get_fields():
+    # Projection : ?fields=id,name,...
+    fields = request.args.get("fields")
+    if not fields:
+        return None
+    return {field.strip() for field in fields.split(",") if field.strip()}
+
+
+def paginate(query, column, limit=None, after=None, lookahead=True):
+    if after is not None:
+        query = query.filter(column > after)
+    if limit is not None or after is not None:
+        query = query.order_by(column)
+    if limit is not None:
+        # Une ligne de plus pour savoir s'il reste une page (sauf en streaming :
+        # tout ce qui est lu est émis, le client repart du dernier id reçu)
+        query = query.limit(limit + 1 if lookahead else limit)
+    return query
+
+
+def page_response(items, limit=None, fields=None):
+    next_cursor = None
+    if limit is not None and len(items) > limit:
+        items = items[:limit]
+        next_cursor = items[-1]["id"]
+
+    if fields:
+        items = [{key: value for key, value in item.items() if key in fields} for item in items]
+
+    response = jsonify(items)
+    if next_cursor is not None:
+        args = request.args.to_dict()
+        args["after"] = next_cursor
+        next_url = url_for(request.endpoint, **(request.view_args or {}), **args)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return response
+
+
+def _parse_int(name, minimum):
+    value = request.args.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+    if value < minimum:
+        raise ValueError(f"{name} must be at least {minimum}")
+    return value
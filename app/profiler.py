@@ -0,0 +1,91 @@
+import cProfile
+import io
+import marshal
+import os
+import random
+import re
+import time
+import uuid
+from flask import g, request, send_file
+from app.auth import get_decoded_token
+from app.config import config, config_int, config_float
+from app.logger import logger
+
+# En-tête de déclenchement : "1" (profil écrit sur disque) ou "download" (profil renvoyé)
+PROFILE_HEADER = "X-Profile"
+PROFILE_SAMPLE_RATE = config_float("PROFILE_SAMPLE_RATE", 0.0)
+PROFILE_DIR = config.get("PROFILE_DIR") or "profiles"
+PROFILE_KEEP = config_int("PROFILE_KEEP", 50)
+
+
+def init_app(app):
+    app.before_request(_start_profile)
+    app.after_request(_end_profile)
+
+
+def _is_admin():
+    try:
+        decoded_token = get_decoded_token()
+    except Exception:
+        return False
+    return bool(decoded_token) and decoded_token.get("role") == "admin"
+
+
+def _requested_mode():
+    mode = request.headers.get(PROFILE_HEADER)
+    if mode in ("1", "download") and _is_admin():
+        return mode
+    if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+        return "sample"
+    return None
+
+
+def _start_profile():
+    mode = _requested_mode()
+    if mode is None:
+        return
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Un autre profileur est déjà actif dans ce thread
+        return
+    g.profile = (profile, mode)
+
+
+def _end_profile(response):
+    profile, mode = g.pop("profile", (None, None))
+    if profile is None:
+        return response
+    profile.disable()
+    profile.create_stats()
+    data = marshal.dumps(profile.stats)
+
+    endpoint = re.sub(r"[^A-Za-z0-9]+", "-", request.url_rule.rule if request.url_rule else request.path).strip("-")
+    filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.method.lower()}-{endpoint or 'root'}-{os.getpid()}-{uuid.uuid4().hex[:6]}.prof"
+
+    if mode == "download":
+        logger.info("Profile of %s %s returned to client", request.method, request.path)
+        return send_file(io.BytesIO(data), mimetype="application/octet-stream",
+                         as_attachment=True, download_name=filename)
+
+    _write_profile(filename, data)
+    logger.info("Profile of %s %s written to %s", request.method, request.path, filename)
+    response.headers["X-Profile-File"] = filename
+    return response
+
+
+def _write_profile(filename, data):
+    # Dossier tournant : on ne garde que les PROFILE_KEEP profils les plus récents
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(os.path.join(PROFILE_DIR, filename), "wb") as f:
+        f.write(data)
+    profiles = sorted(
+        (entry for entry in os.scandir(PROFILE_DIR) if entry.name.endswith(".prof")),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in profiles[:-PROFILE_KEEP]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
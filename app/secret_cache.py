@@ -0,0 +1,48 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.config import config, config_int
+from app.logger import logger
+
+# Secrets Secret Manager : (clé de config de l'identifiant, clé de config de la version)
+POSTGRES_SECRET = ("postgres_access_secret_id", "postgres_access_version_id")
+FIREBASE_SECRET = ("firebase_sdk_admin_secret_id", "firebase_sdk_admin_version_id")
+
+# Délai maximal (s) d'un appel à Secret Manager
+SECRETS_TIMEOUT = config_int("SECRETS_TIMEOUT", 10)
+
+_secrets = {}
+_secrets_lock = threading.Lock()
+
+
+def get_secret(secret):
+    # Payload JSON du secret, récupéré une seule fois par processus
+    # (hérité par les workers gunicorn s'il a été chargé dans le master)
+    with _secrets_lock:
+        if secret in _secrets:
+            return _secrets[secret]
+    prefetch_secrets(secret)
+    return _secrets[secret]
+
+
+def prefetch_secrets(*secrets):
+    missing = [secret for secret in secrets if secret not in _secrets]
+    if not missing:
+        return
+    # Import local : le client gRPC n'est chargé que si un secret est réellement demandé
+    from google.cloud import secretmanager
+
+    with secretmanager.SecretManagerServiceClient() as client:
+        with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+            payloads = list(executor.map(lambda secret: _access(client, secret), missing))
+
+    with _secrets_lock:
+        _secrets.update(zip(missing, payloads))
+    logger.info("Fetched %s secret(s) from Secret Manager", len(missing))
+
+
+def _access(client, secret):
+    secret_id, version_id = secret
+    name = client.secret_version_path(config["project_id"], config[secret_id], config[version_id])
+    response = client.access_secret_version(request={"name": name}, timeout=SECRETS_TIMEOUT)
+    return json.loads(response.payload.data.decode("UTF-8"))
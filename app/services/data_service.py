@@ -1,30 +1,32 @@
 from app.models import Region, Journey, Zone
 from app.database import Session
+from geoalchemy2 import Geometry
+from sqlalchemy import select, cast, func
+from app.pagination import paginate
+from app.metrics import timed
 
 
 def get_zone_by_id(zone_id):
+    location = cast(Zone.location, Geometry(srid=4326))
     with Session() as session:
-        zone = (
-            session.query(Zone)
-            .filter(Zone.id == zone_id)
-            .first()
-        )
-        return zone.to_dict() if zone else None
+        row = session.execute(
+            select(Zone.id, Zone.name, func.ST_X(location).label("x"), func.ST_Y(location).label("y"))
+            .where(Zone.id == zone_id)
+        ).mappings().first()
+        if not row:
+            return None
+        with timed("serialize"):
+            return Zone.from_row(row)
 
 
-def get_regions():
+def get_regions(limit=None, after=None):
+    # Lignes Core {id, name} : même rendu que Region.to_dict
     with Session() as session:
-        query = (
-            session.query(Region)
-        )
-        regions = query.all()
-        return [region.to_dict() for region in regions]
+        query = paginate(select(Region.id, Region.name), Region.id, limit, after)
+        return [dict(row) for row in session.execute(query).mappings()]
 
 
-def get_journeys():
+def get_journeys(limit=None, after=None):
     with Session() as session:
-        query = (
-            session.query(Journey)
-        )
-        journeys = query.all()
-        return [journey.to_dict() for journey in journeys]
+        query = paginate(select(Journey.id, Journey.name), Journey.id, limit, after)
+        return [dict(row) for row in session.execute(query).mappings()]
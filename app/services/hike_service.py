@@ -1,14 +1,39 @@
-from app.models import Hike
+from app.models import Hike, Trail, Journey, Region, Zone, ReviewStats
 from app.database import Session
-from sqlalchemy.orm import joinedload
+from app.cache import cache
+from sqlalchemy import select, insert, update
+from sqlalchemy.orm import joinedload, defer
+from app.trail_tiers import TIERS
+from app.spatial import apply_spatial_filters
+from app.pagination import paginate
+from app.metrics import timed
+from app.services import tile_service
 
+# Nombre de lignes chargées par lot en mode streaming
+STREAM_BATCH_SIZE = 100
 
-def get_hike_by_id(hike_id):
+
+def _defer_trail_geometries(keep=None):
+    # Diffère les géométries du tracé, sauf celle du niveau demandé le cas échéant
+    columns = ["gpx"] + [tier["column"] for tier in TIERS.values()]
+    return [defer(getattr(Trail, column)) for column in columns if column != keep]
+
+
+def _trail_column(tier=None):
+    return TIERS[tier]["column"] if tier else "gpx"
+
+
+def _invalidate_hikes():
+    cache.invalidate("hikes")
+    tile_service.invalidate_tiles()
+
+
+def get_hike_by_id(hike_id, tier=None):
     with Session() as session:
         hike = (
             session.query(Hike)
             .options(
-                joinedload(Hike.trail),
+                joinedload(Hike.trail).options(*_defer_trail_geometries(keep=_trail_column(tier))),
                 joinedload(Hike.region),
                 joinedload(Hike.journey),
                 joinedload(Hike.zone)
@@ -16,25 +41,97 @@ def get_hike_by_id(hike_id):
             .filter(Hike.id == hike_id)
             .first()
         )
-        return hike.to_dict() if hike else None
+        return hike.to_dict(tier) if hike else None
 
 
-def get_hikes(filters=None):
+def get_hike_trail(hike_id, tier=None):
     with Session() as session:
-        query = (
-            session.query(Hike)
-            .options(
-                joinedload(Hike.trail),
-                joinedload(Hike.region),
-                joinedload(Hike.journey),
-                joinedload(Hike.zone)
-            )
+        trail = (
+            session.query(Trail)
+            .options(*_defer_trail_geometries(keep=_trail_column(tier)))
+            .join(Trail.hikes)
+            .filter(Hike.id == hike_id)
+            .first()
         )
-        if filters:
-            if "zone_id" in filters:
-                query = query.filter(Hike.zone_id == filters['zone_id'])
-        hikes = query.all()
-        return [hike.to_dict() for hike in hikes]
+        return trail.to_dict(tier) if trail else None
+
+
+def get_hike_trail_coordinates(hike_id, tier=None):
+    with Session() as session:
+        trail = (
+            session.query(Trail)
+            .options(*_defer_trail_geometries(keep=_trail_column(tier)))
+            .join(Trail.hikes)
+            .filter(Hike.id == hike_id)
+            .first()
+        )
+        if not trail:
+            return None
+        return trail.id, trail.get_coordinates(tier)
+
+
+# Colonnes lues pour chaque clé de la vue liste (cf. Hike.summary_from_row)
+SUMMARY_FIELD_COLUMNS = {
+    "id": (Hike.id,),
+    "name": (Hike.name,),
+    "distance": (Hike.distance, Trail.distance.label("trail_distance")),
+    "elevation": (Hike.elevation, Trail.elevation_gain.label("trail_elevation_gain")),
+    "difficulty": (Hike.difficulty,),
+    "duration": (Hike.duration,),
+    "journey": (Journey.id.label("journey_id"), Journey.name.label("journey_name")),
+    "trail": tuple(getattr(Trail, column).label(f"trail_{column}") for column in Trail.SUMMARY_COLUMNS),
+    "region": (Region.id.label("region_id"), Region.name.label("region_name")),
+    "reviews": (ReviewStats.count.label("reviews_count"), ReviewStats.rate_sum.label("reviews_rate_sum")),
+}
+TRAIL_FIELDS = {"distance", "elevation", "trail"}
+
+
+def _summary_fields(fields=None):
+    # Clés rendues pour ?fields= ; l'id est toujours lu (curseur de pagination)
+    if not fields:
+        return None
+    return {field for field in SUMMARY_FIELD_COLUMNS if field in fields or field == "id"}
+
+
+def _summary_select(filters=None, fields=None):
+    # Vue liste en Core : une ligne plate par randonnée, sans géométrie ni hydratation ORM
+    # (rendu par Hike.summary_from_row, identique à Hike.to_summary_dict).
+    # Avec `fields`, seules les colonnes et jointures des clés demandées sont lues
+    selected = [field for field in SUMMARY_FIELD_COLUMNS if fields is None or field in fields]
+    query = select(*[column for field in selected for column in SUMMARY_FIELD_COLUMNS[field]]).select_from(Hike)
+    spatial = filters and ("bbox" in filters or "near" in filters)
+    if "journey" in selected:
+        query = query.join(Hike.journey)
+    if "region" in selected:
+        query = query.join(Hike.region)
+    if spatial or TRAIL_FIELDS.intersection(selected):
+        query = query.outerjoin(Hike.trail)
+    if "reviews" in selected:
+        query = query.outerjoin(Hike.review_stats)
+    if filters:
+        if "zone_id" in filters:
+            query = query.where(Hike.zone_id == filters['zone_id'])
+        query = apply_spatial_filters(query, Trail.gpx, filters)
+    return query
+
+
+def get_hikes(filters=None, limit=None, after=None, fields=None):
+    fields = _summary_fields(fields)
+    with Session() as session:
+        query = paginate(_summary_select(filters, fields), Hike.id, limit, after)
+        rows = session.execute(query).mappings().all()
+        # Rendu de la liste mesuré d'un bloc, pas ligne par ligne
+        with timed("serialize"):
+            return [Hike.summary_from_row(row, fields) for row in rows]
+
+
+def iter_hikes(filters=None, limit=None, after=None, fields=None):
+    fields = _summary_fields(fields)
+    with Session() as session:
+        query = paginate(_summary_select(filters, fields), Hike.id, limit, after, lookahead=False)
+        rows = session.execute(query.execution_options(yield_per=STREAM_BATCH_SIZE)).mappings()
+        for row in rows:
+            yield Hike.summary_from_row(row, fields)
 
 
 def update_hike(hike_id, data):
@@ -52,6 +149,7 @@ def update_hike(hike_id, data):
         hike.description = data['description']
 
         session.commit()
+        _invalidate_hikes()
         session.refresh(hike)
         return hike.to_dict()
 
@@ -72,13 +170,131 @@ def create_hike(data):
 
         session.add(new_hike)
         session.commit()
+        _invalidate_hikes()
         session.refresh(new_hike)
         return new_hike.to_dict()
 
 
+# Types attendus par élément d'un lot : une valeur invalide est rejetée pour cet
+# élément seul, au lieu d'une erreur SQL (DataError) qui ferait échouer tout le lot
+BATCH_FIELD_TYPES = {
+    "name": (str,),
+    "distance": (int, float),
+    "elevation": (int,),
+    "difficulty": (int,),
+    "duration": (int,),
+    "description": (str,),
+}
+
+
+# Bornes d'une colonne integer PostgreSQL (int4)
+INT4_MIN, INT4_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+def _strict_int(value, name):
+    # bool est une sous-classe d'int : refusé explicitement
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise TypeError(f"{name} must be an integer")
+    if not INT4_MIN <= value <= INT4_MAX:
+        raise TypeError(f"{name} is out of range")
+    return value
+
+
+def _hike_values(data, create=False):
+    values = {
+        "name": data['name'],
+        "distance": data['distance'],
+        "elevation": data['elevation'],
+        "difficulty": data['difficulty'],
+        "duration": data['duration'],
+        "description": data['description'],
+        "journey_id": _strict_int(data['journey']['id'], "journey.id"),
+        "region_id": _strict_int(data['region']['id'], "region.id"),
+    }
+    for field, types in BATCH_FIELD_TYPES.items():
+        value = values[field]
+        if value is None:
+            continue
+        if types == (int,):
+            _strict_int(value, field)
+        elif not isinstance(value, types) or isinstance(value, bool):
+            raise TypeError(f"{field} has an invalid type")
+        elif isinstance(value, int) and not -2 ** 53 <= value <= 2 ** 53:
+            # Entier converti en double precision : au-delà, la valeur n'est plus exacte
+            raise TypeError(f"{field} is out of range")
+    if create:
+        values["zone_id"] = _strict_int(data['zone_id'], "zone_id")
+    return values
+
+
+def _missing_references(session, values):
+    # Références inconnues, vérifiées en amont pour ne pas faire échouer tout le lot
+    missing = {}
+    for model, key in ((Journey, "journey_id"), (Region, "region_id"), (Zone, "zone_id")):
+        ids = {item[key] for item in values if key in item}
+        if ids:
+            known = set(session.scalars(select(model.id).where(model.id.in_(ids))))
+            missing[key] = ids - known
+    return missing
+
+
+def save_hikes(items):
+    # Création (sans id) ou mise à jour (avec id) en lot, dans une seule transaction
+    results = [None] * len(items)
+    creates, updates = [], []
+    for index, data in enumerate(items):
+        try:
+            hike_id = data.get('id')
+            if hike_id is not None:
+                _strict_int(hike_id, "id")
+            values = _hike_values(data, create=hike_id is None)
+        except (AttributeError, KeyError, TypeError) as e:
+            results[index] = {"index": index, "status": 400, "error": f"Invalid hike: {str(e)}"}
+            continue
+        if hike_id is None:
+            creates.append((index, values))
+        else:
+            updates.append((index, {"id": hike_id, **values}))
+
+    with Session() as session:
+        missing = _missing_references(session, [values for _, values in creates + updates])
+        existing = set(session.scalars(select(Hike.id).where(Hike.id.in_([values["id"] for _, values in updates]))))
+
+        valid_creates, valid_updates = [], []
+        for index, values in creates + updates:
+            unknown = [key for key, ids in missing.items() if values.get(key) in ids]
+            if unknown:
+                results[index] = {"index": index, "status": 400, "error": f"Unknown {', '.join(unknown)}"}
+            elif "id" in values and values["id"] not in existing:
+                results[index] = {"index": index, "id": values["id"], "status": 404, "error": "Hike not found"}
+            elif "id" in values:
+                valid_updates.append((index, values))
+            else:
+                valid_creates.append((index, values))
+
+        if valid_creates:
+            hike_ids = session.scalars(
+                insert(Hike).returning(Hike.id, sort_by_parameter_order=True),
+                [values for _, values in valid_creates]
+            ).all()
+            for (index, _), hike_id in zip(valid_creates, hike_ids):
+                results[index] = {"index": index, "id": hike_id, "status": 201}
+        if valid_updates:
+            # UPDATE groupé par clé primaire
+            session.execute(update(Hike), [values for _, values in valid_updates])
+            for index, values in valid_updates:
+                results[index] = {"index": index, "id": values["id"], "status": 200}
+        session.commit()
+
+    if valid_creates or valid_updates:
+        _invalidate_hikes()
+    return results
+
+
 def delete_hike(hike_id):
     with Session() as session:
         hike = session.get(Hike, hike_id)
 
         session.delete(hike)
         session.commit()
+        _invalidate_hikes()
@@ -1,35 +1,117 @@
-from app.models import Review
+from app.models import Review, ReviewStats, Hike
 from app.database import Session
-from sqlalchemy.orm import joinedload
+from app.cache import cache
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from app.pagination import paginate
 
+# Nombre de lignes chargées par lot en mode streaming
+STREAM_BATCH_SIZE = 500
 
-def get_reviews(filters=None):
+
+def _query_reviews(session, filters=None):
+    query = session.query(Review)
+    if filters:
+        if "hike_id" in filters:
+            query = query.filter(Review.hike_id == filters['hike_id'])
+    return query
+
+
+def get_reviews(filters=None, limit=None, after=None):
     with Session() as session:
-        query = (
-            session.query(Review)
-            .options(
-                joinedload(Review.hike)
-            )
-        )
-        if filters:
-            if "hike_id" in filters:
-                query = query.filter(Review.hike_id == filters['hike_id'])
+        query = paginate(_query_reviews(session, filters), Review.id, limit, after)
         reviews = query.all()
         return [review.to_dict() for review in reviews]
 
 
+def iter_reviews(filters=None, limit=None, after=None):
+    with Session() as session:
+        query = paginate(_query_reviews(session, filters), Review.id, limit, after, lookahead=False)
+        for review in query.yield_per(STREAM_BATCH_SIZE):
+            yield review.to_dict()
+
+
+def get_review_stats(hike_id):
+    with Session() as session:
+        stats = session.get(ReviewStats, hike_id)
+        if stats:
+            return stats.to_dict()
+        if session.get(Hike, hike_id) is None:
+            return None
+        return ReviewStats.empty_dict(hike_id)
+
+
 def update_review(review_id, data):
     with Session() as session:
-        review = session.get(Review, review_id)
+        review = session.get(Review, review_id, with_for_update=True)
         if not review:
             return None
+        was_validated = bool(review.is_validated)
         review.is_validated = data['is_validated']
+        if bool(review.is_validated) != was_validated:
+            _update_stats(session, review.hike_id, review.rate, 1 if review.is_validated else -1)
 
         session.commit()
+        cache.invalidate("reviews", "hikes")
         session.refresh(review)
         return review.to_dict()
 
 
+def moderate_reviews(items):
+    # Validation en lot : [{id, is_validated}] appliqué dans une seule transaction
+    results = [None] * len(items)
+    decisions = {}
+    for index, data in enumerate(items):
+        review_id = data.get("id") if isinstance(data, dict) else None
+        is_validated = data.get("is_validated") if isinstance(data, dict) else None
+        if not isinstance(review_id, int) or isinstance(review_id, bool) or not isinstance(is_validated, bool):
+            results[index] = {"index": index, "status": 400, "error": "Expected {id, is_validated}"}
+        elif review_id in decisions:
+            results[index] = {"index": index, "id": review_id, "status": 400, "error": "Duplicate review"}
+        else:
+            decisions[review_id] = (index, is_validated)
+
+    with Session() as session:
+        existing = set(session.scalars(select(Review.id).where(Review.id.in_(list(decisions)))))
+        changed = {}
+        for value in (True, False):
+            review_ids = [review_id for review_id, (_, is_validated) in decisions.items()
+                          if is_validated is value and review_id in existing]
+            if not review_ids:
+                continue
+            # Seules les lignes dont l'état change sont modifiées et renvoyées
+            statement = (
+                update(Review)
+                .where(Review.id.in_(review_ids), Review.is_validated.is_distinct_from(value))
+                .values(is_validated=value)
+                .returning(Review.id, Review.hike_id, Review.rate)
+                .execution_options(synchronize_session=False)
+            )
+            for review_id, hike_id, rate in session.execute(statement):
+                changed[review_id] = (hike_id, rate, 1 if value else -1)
+
+        totals = {}
+        for hike_id, rate, delta in changed.values():
+            increments = _stats_increments(rate, delta)
+            current = totals.setdefault(hike_id, dict.fromkeys(increments, 0))
+            for column, value in increments.items():
+                current[column] += value
+        if totals:
+            _apply_stats(session, totals)
+        session.commit()
+
+    if changed:
+        cache.invalidate("reviews", "hikes")
+
+    for review_id, (index, is_validated) in decisions.items():
+        if review_id not in existing:
+            results[index] = {"index": index, "id": review_id, "status": 404, "error": "Review not found"}
+        else:
+            results[index] = {"index": index, "id": review_id, "status": 200,
+                              "is_validated": is_validated, "changed": review_id in changed}
+    return results
+
+
 def create_review(data):
     with Session() as session:
         new_review = Review(
@@ -42,13 +124,44 @@ def create_review(data):
 
         session.add(new_review)
         session.commit()
+        cache.invalidate("reviews")
         session.refresh(new_review)
         return new_review.to_dict()
 
 
 def delete_review(review_id):
     with Session() as session:
-        review = session.get(Review, review_id)
+        review = session.get(Review, review_id, with_for_update=True)
+        if review.is_validated:
+            _update_stats(session, review.hike_id, review.rate, -1)
 
         session.delete(review)
         session.commit()
+        cache.invalidate("reviews", "hikes")
+
+
+def _stats_increments(rate, delta):
+    increments = {"count": delta, "rate_sum": delta * (rate or 0)}
+    for value in ReviewStats.RATES:
+        increments[f"rate_{value}"] = delta if rate == value else 0
+    return increments
+
+
+def _update_stats(session, hike_id, rate, delta):
+    # delta = +1 / -1
+    _apply_stats(session, {hike_id: _stats_increments(rate, delta)})
+
+
+def _apply_stats(session, increments_by_hike):
+    # Mise à jour atomique (upsert multi-lignes) des agrégats, une ligne par randonnée
+    rows = [{"hike_id": hike_id, **increments} for hike_id, increments in increments_by_hike.items()]
+    statement = insert(ReviewStats).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[ReviewStats.hike_id],
+        set_={
+            **{column: getattr(ReviewStats, column) + getattr(statement.excluded, column)
+               for column in rows[0] if column != "hike_id"},
+            "updated_at": func.now(),
+        }
+    )
+    session.execute(statement)
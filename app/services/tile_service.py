@@ -0,0 +1,89 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import text
+from app.database import Session
+from app.trail_tiers import TIERS, select_tier
+
+# Cache des tuiles en mémoire (par worker) : (z, x, y) -> (expiration, tuile, etag)
+TILE_CACHE_SIZE = 2048
+TILE_CACHE_TTL = 300
+
+_tile_cache = OrderedDict()
+_tile_cache_lock = threading.Lock()
+
+TILE_QUERY = """
+WITH bounds AS (
+    -- Filtre en géométrie planaire 4326 : converti en geography, l'emprise des tuiles
+    -- des petits zooms (z=0-1, ±180°) dégénère en polygone géodésique faux
+    SELECT ST_TileEnvelope(:z, :x, :y) AS geom,
+           ST_Transform(ST_TileEnvelope(:z, :x, :y), 4326) AS geom_4326
+),
+hikes AS (
+    SELECT h.id, h.name, h.difficulty, h.duration, t.distance, t.elevation_gain,
+           ST_AsMVTGeom(ST_Transform(COALESCE({trail_column}, t.gpx)::geometry, 3857), bounds.geom) AS geom
+    FROM hikes h
+    JOIN trails t ON t.id = h.trail_id
+    CROSS JOIN bounds
+    WHERE ST_Intersects(t.gpx::geometry, bounds.geom_4326)
+),
+zones AS (
+    SELECT z.id, z.name,
+           ST_AsMVTGeom(ST_Transform(z.location::geometry, 3857), bounds.geom) AS geom
+    FROM zones z
+    CROSS JOIN bounds
+    WHERE ST_Intersects(z.location::geometry, bounds.geom_4326)
+),
+viewpoints AS (
+    SELECT v.id, v.name, v.hike_id,
+           ST_AsMVTGeom(ST_Transform(v.location::geometry, 3857), bounds.geom) AS geom
+    FROM viewpoints v
+    CROSS JOIN bounds
+    WHERE ST_Intersects(v.location::geometry, bounds.geom_4326)
+)
+SELECT COALESCE((SELECT ST_AsMVT(hikes, 'hikes', 4096, 'geom') FROM hikes), ''::bytea)
+    || COALESCE((SELECT ST_AsMVT(zones, 'zones', 4096, 'geom') FROM zones), ''::bytea)
+    || COALESCE((SELECT ST_AsMVT(viewpoints, 'viewpoints', 4096, 'geom') FROM viewpoints), ''::bytea)
+"""
+
+
+def is_valid_tile(z, x, y):
+    return 0 <= z <= 22 and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+
+def get_tile(z, x, y):
+    key = (z, x, y)
+    with _tile_cache_lock:
+        cached = _tile_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            _tile_cache.move_to_end(key)
+            return cached[1], cached[2]
+
+    tile = _render_tile(z, x, y)
+    etag = hashlib.md5(tile).hexdigest()
+
+    with _tile_cache_lock:
+        _tile_cache[key] = (time.monotonic() + TILE_CACHE_TTL, tile, etag)
+        _tile_cache.move_to_end(key)
+        while len(_tile_cache) > TILE_CACHE_SIZE:
+            _tile_cache.popitem(last=False)
+    return tile, etag
+
+
+def invalidate_tiles():
+    # Appelé après les écritures sur les randonnées / tracés (cache propre au worker)
+    with _tile_cache_lock:
+        _tile_cache.clear()
+
+
+def _render_tile(z, x, y):
+    # Aux petits zooms on s'appuie sur les tracés simplifiés stockés
+    tier = select_tier(zoom=z)
+    trail_column = f"t.{TIERS[tier]['column']}" if tier else "t.gpx"
+    with Session() as session:
+        tile = session.execute(
+            text(TILE_QUERY.format(trail_column=trail_column)),
+            {"z": z, "x": x, "y": y}
+        ).scalar()
+        return bytes(tile) if tile else b""
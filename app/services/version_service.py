@@ -0,0 +1,21 @@
+from sqlalchemy import text
+from app.database import Session
+
+# Versions maintenues par trigger sur chaque écriture (migrations/009_table_versions.sql)
+SELECT_VERSIONS = text("""
+    SELECT table_name, version, updated_at FROM table_versions
+    WHERE table_name = ANY(:tables)
+""")
+
+
+def get_version(*models):
+    # Version d'un ensemble de tables : compteur d'écritures + date de la dernière écriture
+    # (une lecture par clé primaire, les suppressions font aussi avancer la version)
+    tables = [model.__table__.name for model in models]
+    with Session() as session:
+        rows = {row.table_name: row for row in session.execute(SELECT_VERSIONS, {"tables": tables})}
+
+    version = tuple(rows[table].version if table in rows else 0 for table in tables)
+    timestamps = [row.updated_at for row in rows.values()]
+    last_modified = max(timestamps) if timestamps else None
+    return version, last_modified
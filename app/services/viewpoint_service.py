@@ -1,18 +1,27 @@
 from app.models import Viewpoint
 from app.database import Session
-from sqlalchemy.orm import joinedload
+from geoalchemy2 import Geometry
+from sqlalchemy import select, cast, func
+from app.spatial import apply_spatial_filters
+from app.pagination import paginate
+from app.metrics import timed
 
 
-def get_viewpoints(filters=None):
+def get_viewpoints(filters=None, limit=None, after=None):
+    # Coordonnées extraites par PostGIS (ST_X / ST_Y) : pas de décodage WKB côté Python
+    location = cast(Viewpoint.location, Geometry(srid=4326))
     with Session() as session:
-        query = (
-            session.query(Viewpoint)
-            .options(
-                joinedload(Viewpoint.hike)
-            )
+        query = select(
+            Viewpoint.id,
+            Viewpoint.name,
+            func.ST_X(location).label("x"),
+            func.ST_Y(location).label("y"),
         )
         if filters:
             if "hike_id" in filters:
-                query = query.filter(Viewpoint.hike_id == filters['hike_id'])
-        viewpoints = query.all()
-        return [viewpoint.to_dict() for viewpoint in viewpoints]
+                query = query.where(Viewpoint.hike_id == filters['hike_id'])
+            query = apply_spatial_filters(query, Viewpoint.location, filters)
+        query = paginate(query, Viewpoint.id, limit, after)
+        rows = session.execute(query).mappings().all()
+        with timed("serialize"):
+            return [Viewpoint.from_row(row) for row in rows]
@@ -0,0 +1,90 @@
+import math
+from sqlalchemy import cast, func
+from geoalchemy2 import Geography
+
+# Rayon par défaut (en mètres) de la recherche ?near=
+DEFAULT_RADIUS = 5000
+MAX_NEAREST = 100
+
+
+def parse_spatial_filters(args):
+    filters = {}
+
+    bbox = args.get("bbox")
+    if bbox:
+        # bbox=<ouest>,<sud>,<est>,<nord>
+        west, south, east, north = _parse_floats(bbox, 4, "bbox")
+        if not (-180 <= west <= 180 and -180 <= east <= 180 and -90 <= south < north <= 90):
+            raise ValueError("Invalid bbox")
+        filters["bbox"] = (west, south, east, north)
+
+    near = args.get("near")
+    if near:
+        # near=<lat>,<lng>
+        lat, lng = _parse_floats(near, 2, "near")
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise ValueError("Invalid near coordinates")
+        filters["near"] = (lat, lng)
+
+    nearest = _parse_number(args, "nearest", int)
+    if nearest is not None:
+        if "near" not in filters:
+            raise ValueError("nearest requires near=<lat>,<lng>")
+        if not 0 < nearest <= MAX_NEAREST:
+            raise ValueError(f"nearest must be between 1 and {MAX_NEAREST}")
+        if args.get("limit") or args.get("after"):
+            raise ValueError("nearest cannot be combined with limit/after")
+        filters["nearest"] = nearest
+
+    radius = _parse_number(args, "radius", float)
+    if radius is not None and not (math.isfinite(radius) and radius > 0):
+        raise ValueError("radius must be a positive number")
+    if "near" in filters and ("nearest" not in filters or radius is not None):
+        filters["radius"] = radius or DEFAULT_RADIUS
+
+    return filters
+
+
+def apply_spatial_filters(query, column, filters):
+    if not filters:
+        return query
+    if "bbox" in filters:
+        envelope = cast(func.ST_MakeEnvelope(*filters["bbox"], 4326), Geography(srid=4326))
+        query = query.filter(func.ST_Intersects(column, envelope))
+    if "near" in filters:
+        point = make_point(*filters["near"])
+        if "radius" in filters:
+            query = query.filter(func.ST_DWithin(column, point, filters["radius"]))
+        if "nearest" in filters:
+            # Opérateur KNN <-> : tri par distance servi par l'index GiST
+            query = (
+                query.filter(column.isnot(None))
+                .order_by(column.op("<->")(point))
+                .limit(filters["nearest"])
+            )
+    return query
+
+
+def make_point(lat, lng):
+    return cast(func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326), Geography(srid=4326))
+
+
+def _parse_floats(value, count, name):
+    try:
+        values = [float(part) for part in value.split(",")]
+    except ValueError:
+        raise ValueError(f"Invalid {name}")
+    if len(values) != count:
+        raise ValueError(f"Invalid {name}")
+    return values
+
+
+def _parse_number(args, name, type):
+    # Valeur invalide => 400 (args.get(..., type=...) la remplacerait silencieusement par None)
+    value = args.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return type(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}")
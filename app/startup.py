@@ -0,0 +1,30 @@
+import time
+from sqlalchemy.exc import OperationalError
+from app.auth import get_firebase_app
+from app.config import env, config_bool
+from app.database import get_engine
+from app.secret_cache import prefetch_secrets, POSTGRES_SECRET, FIREBASE_SECRET
+from app.logger import logger
+
+# Ouvre une première connexion du pool pendant le démarrage du worker
+WARMUP_DB_CONNECT = config_bool("WARMUP_DB_CONNECT", True)
+
+
+def prefetch():
+    # Secrets récupérés une seule fois par worker, en parallèle
+    if env != "dev":
+        prefetch_secrets(POSTGRES_SECRET, FIREBASE_SECRET)
+
+
+def warm_up():
+    # Dans chaque worker, avant la première requête
+    start = time.perf_counter()
+    engine = get_engine()
+    get_firebase_app()
+    if WARMUP_DB_CONNECT:
+        try:
+            with engine.connect():
+                pass
+        except OperationalError as e:
+            logger.warning("Database warm-up failed: %s", e)
+    logger.info("Worker warmed up in %.0f ms", (time.perf_counter() - start) * 1000)
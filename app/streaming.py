@@ -0,0 +1,21 @@
+from flask import request, current_app, stream_with_context, Response
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def wants_ndjson():
+    # ?stream=1 ou Accept: application/x-ndjson
+    if request.args.get("stream") in ("1", "true"):
+        return True
+    return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+
+def ndjson_response(items, fields=None):
+    # Une ligne JSON par élément, émise au fil de l'itération (mémoire constante)
+    def generate():
+        for item in items:
+            if fields:
+                item = {key: value for key, value in item.items() if key in fields}
+            yield current_app.json.dumps(item) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
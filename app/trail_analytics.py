@@ -0,0 +1,89 @@
+import numpy as np
+from pyproj import Geod
+from shapely import get_coordinates
+
+geodesic = Geod(ellps="WGS84")
+
+# Paramètres par défaut du calcul de dénivelé :
+# - step : on ne garde qu'un point sur `step` (comportement historique : 10)
+# - threshold : hystérésis (m), écart minimal à la dernière altitude retenue pour compter une variation
+# - smoothing : largeur (en points) de la moyenne glissante appliquée aux altitudes
+DEFAULT_STEP = 10
+DEFAULT_THRESHOLD = 0.0
+DEFAULT_SMOOTHING = 1
+
+
+def trail_coordinates(line):
+    return get_coordinates(line, include_z=True)
+
+
+def cumulative_distance(coordinates):
+    if len(coordinates) < 2:
+        return np.zeros(len(coordinates))
+    _, _, segments = geodesic.inv(
+        coordinates[:-1, 0], coordinates[:-1, 1],
+        coordinates[1:, 0], coordinates[1:, 1]
+    )
+    return np.concatenate(([0.0], np.cumsum(segments)))
+
+
+def smooth_altitudes(altitudes, window=DEFAULT_SMOOTHING):
+    if window <= 1 or len(altitudes) < window:
+        return altitudes
+    left = window // 2
+    padded = np.pad(altitudes, (left, window - 1 - left), mode="edge")
+    return np.convolve(padded, np.ones(window) / window, mode="valid")
+
+
+def elevation_changes(altitudes, step=DEFAULT_STEP, threshold=DEFAULT_THRESHOLD):
+    sampled = altitudes[::step]
+    # Les NaN (tracé sans altitude) sont écartés
+    sampled = sampled[~np.isnan(sampled)]
+    if threshold <= 0:
+        steps = np.diff(sampled)
+        return float(steps[steps > 0].sum()), float(np.abs(steps[steps < 0]).sum())
+    return _hysteresis_changes(sampled.tolist(), threshold)
+
+
+def _hysteresis_changes(altitudes, threshold):
+    # Hystérésis : une variation n'est comptée que lorsque l'écart à l'altitude de
+    # référence atteint `threshold`, la référence passant alors au point courant.
+    # Séquentiel par nature, mais limité aux points échantillonnés
+    gain = loss = 0.0
+    if not altitudes:
+        return gain, loss
+    reference = altitudes[0]
+    for altitude in altitudes:
+        change = altitude - reference
+        if change >= threshold:
+            gain += change
+            reference = altitude
+        elif change <= -threshold:
+            loss -= change
+            reference = altitude
+    return gain, loss
+
+
+def max_slope(distances, altitudes, step=DEFAULT_STEP):
+    rises = np.diff(altitudes[::step])
+    runs = np.diff(distances[::step])
+    valid = (runs > 0) & ~np.isnan(rises)
+    if not valid.any():
+        return None
+    return float(np.max(np.abs(rises[valid] / runs[valid])) * 100)
+
+
+def analyse_trail(coordinates, step=DEFAULT_STEP, threshold=DEFAULT_THRESHOLD, smoothing=DEFAULT_SMOOTHING):
+    distances = cumulative_distance(coordinates)
+    altitudes = smooth_altitudes(coordinates[:, 2], smoothing)
+    gain, loss = elevation_changes(altitudes, step, threshold)
+    has_altitude = len(altitudes) > 0 and not np.all(np.isnan(altitudes))
+
+    return {
+        "distance": float(distances[-1]) if len(distances) else 0.0,
+        "elevation_gain": gain,
+        "elevation_loss": loss,
+        "min_altitude": float(np.nanmin(altitudes)) if has_altitude else None,
+        "max_altitude": float(np.nanmax(altitudes)) if has_altitude else None,
+        "max_slope": max_slope(distances, altitudes, step),
+    }
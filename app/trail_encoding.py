@@ -0,0 +1,117 @@
+import numpy as np
+
+# Formats compacts proposés en alternative au GeoJSON des tracés
+FORMATS = ("geojson", "polyline", "delta", "protobuf")
+PROTOBUF_MIMETYPE = "application/x-protobuf"
+
+# Précision : 5 décimales (~1 m) en lat/lng, 1 décimale en altitude
+PRECISION = 5
+ELEVATION_PRECISION = 1
+
+
+def quantized_deltas(values, precision):
+    scaled = np.round(values * 10 ** precision).astype(np.int64)
+    return np.diff(scaled, prepend=0)
+
+
+def elevation_deltas(coordinates, precision=ELEVATION_PRECISION):
+    # Altitudes absentes (NaN) : signalées par leurs indices, jamais encodées comme 0 m.
+    # Le point reprend l'altitude du précédent (delta nul) ; aucune altitude -> None
+    elevations = coordinates[:, 2]
+    known = ~np.isnan(elevations)
+    missing = np.flatnonzero(~known)
+    if not known.any():
+        return None, missing
+    if len(missing):
+        indexes = np.where(known, np.arange(len(elevations)), np.argmax(known))
+        elevations = elevations[np.maximum.accumulate(indexes)]
+    return quantized_deltas(elevations, precision), missing
+
+
+def encode_polyline(coordinates, precision=PRECISION):
+    # Algorithme "encoded polyline" de Google, sur des couples (lat, lng)
+    lat = quantized_deltas(coordinates[:, 1], precision)
+    lng = quantized_deltas(coordinates[:, 0], precision)
+    return _encode_values(np.column_stack((lat, lng)).ravel())
+
+
+def encode_elevation(coordinates, precision=ELEVATION_PRECISION):
+    deltas, missing = elevation_deltas(coordinates, precision)
+    return (_encode_values(deltas) if deltas is not None else None), missing
+
+
+def to_polyline(trail_id, coordinates):
+    elevation, missing = encode_elevation(coordinates)
+    return {
+        "id": trail_id,
+        "format": "polyline",
+        "precision": PRECISION,
+        "elevation_precision": ELEVATION_PRECISION,
+        "polyline": encode_polyline(coordinates),
+        "elevation": elevation,
+        "elevation_missing": missing,
+    }
+
+
+def to_delta(trail_id, coordinates):
+    ele, missing = elevation_deltas(coordinates)
+    return {
+        "id": trail_id,
+        "format": "delta",
+        "precision": PRECISION,
+        "elevation_precision": ELEVATION_PRECISION,
+        "lng": quantized_deltas(coordinates[:, 0], PRECISION),
+        "lat": quantized_deltas(coordinates[:, 1], PRECISION),
+        "ele": ele,
+        "ele_missing": missing,
+    }
+
+
+def to_protobuf(trail_id, coordinates):
+    # Message kavale.Trail (cf. proto/trail.proto), encodé directement au format filaire
+    ele, missing = elevation_deltas(coordinates)
+    return b"".join((
+        _field_varint(1, trail_id),
+        _field_varint(2, PRECISION),
+        _field_varint(3, ELEVATION_PRECISION),
+        _field_packed_sint(4, quantized_deltas(coordinates[:, 0], PRECISION)),
+        _field_packed_sint(5, quantized_deltas(coordinates[:, 1], PRECISION)),
+        _field_packed_sint(6, ele if ele is not None else ()),
+        _field_packed_uint(7, missing),
+    ))
+
+
+def _encode_values(values):
+    chunks = []
+    for value in ((values << 1) ^ (values >> 63)).tolist():
+        while value >= 0x20:
+            chunks.append(chr((0x20 | (value & 0x1f)) + 63))
+            value >>= 5
+        chunks.append(chr(value + 63))
+    return "".join(chunks)
+
+
+def _varint(value):
+    encoded = bytearray()
+    while value > 0x7f:
+        encoded.append((value & 0x7f) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _field_varint(field, value):
+    return _varint(field << 3) + _varint(value) if value else b""
+
+
+def _field_packed_sint(field, values):
+    if not len(values):
+        return b""
+    return _field_packed_uint(field, (values << 1) ^ (values >> 63))
+
+
+def _field_packed_uint(field, values):
+    if not len(values):
+        return b""
+    payload = b"".join(_varint(value) for value in values.tolist())
+    return _varint(field << 3 | 2) + _varint(len(payload)) + payload
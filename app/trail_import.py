@@ -0,0 +1,128 @@
+import json
+import os
+import xml.etree.ElementTree as ET
+from array import array
+import numpy as np
+import shapely
+from shapely import LineString
+from app.trail_metrics import compute_trail_metrics
+from app.trail_tiers import compute_trail_tiers
+
+EXTENSIONS = (".gpx", ".geojson", ".json")
+MIN_POINTS = 2
+
+
+class TrailImportError(ValueError):
+    pass
+
+
+def find_track_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def read_gpx(path):
+    # Lecture incrémentale : chaque point est libéré dès qu'il a été lu
+    values = array("d")
+    route_values = array("d")
+    for _, element in ET.iterparse(path, events=("end",)):
+        tag = element.tag.rsplit("}", 1)[-1]
+        if tag in ("trkpt", "rtept"):
+            elevation = next((child.text for child in element if child.tag.rsplit("}", 1)[-1] == "ele"), None)
+            target = values if tag == "trkpt" else route_values
+            target.extend((
+                float(element.get("lon")),
+                float(element.get("lat")),
+                float(elevation) if elevation else np.nan,
+            ))
+            element.clear()
+    # Pas de trace enregistrée : on se rabat sur l'itinéraire (rtept)
+    return np.frombuffer(values or route_values, dtype=np.float64).reshape(-1, 3)
+
+
+def read_geojson(path):
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("type") == "FeatureCollection":
+        geometries = [feature["geometry"] for feature in data.get("features", []) if feature.get("geometry")]
+    elif data.get("type") == "Feature":
+        geometries = [data["geometry"]]
+    else:
+        geometries = [data]
+
+    lines = []
+    for geometry in geometries:
+        if geometry["type"] == "LineString":
+            lines.append(geometry["coordinates"])
+        elif geometry["type"] == "MultiLineString":
+            lines.extend(geometry["coordinates"])
+    if not lines:
+        raise TrailImportError("no LineString geometry")
+    points = [point[:3] + [np.nan] * (3 - len(point[:3])) for line in lines for point in line]
+    return np.asarray(points, dtype=np.float64)
+
+
+def read_track(path):
+    if path.lower().endswith(".gpx"):
+        return read_gpx(path)
+    return read_geojson(path)
+
+
+def validate_track(coordinates):
+    if len(coordinates) < MIN_POINTS:
+        raise TrailImportError(f"track has {len(coordinates)} point(s)")
+    lng, lat = coordinates[:, 0], coordinates[:, 1]
+    if not (np.isfinite(lng).all() and np.isfinite(lat).all()):
+        raise TrailImportError("track has invalid coordinates")
+    if (np.abs(lng) > 180).any() or (np.abs(lat) > 90).any():
+        raise TrailImportError("track coordinates are out of range")
+
+
+def fill_elevations(coordinates):
+    # NaN n'est pas une ordonnée WKT valide : tracé sans aucune altitude -> ligne 2D,
+    # altitudes manquantes par endroits -> interpolées entre les points voisins
+    elevations = coordinates[:, 2]
+    known = np.isfinite(elevations)
+    if not known.any():
+        return coordinates[:, :2]
+    if not known.all():
+        indexes = np.arange(len(elevations))
+        coordinates = coordinates.copy()
+        coordinates[:, 2] = np.interp(indexes, indexes[known], elevations[known])
+    return coordinates
+
+
+def prepare_trail(path, simplify=None):
+    # Exécuté dans un processus de travail : lecture, validation, simplification
+    # et calcul des colonnes dérivées. Les géométries sont renvoyées en EWKT.
+    try:
+        coordinates = read_track(path)
+        validate_track(coordinates)
+        coordinates = fill_elevations(coordinates)
+    except (OSError, ET.ParseError, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        return {"path": path, "error": str(e)}
+
+    line = LineString(coordinates)
+    if simplify:
+        line = line.simplify(simplify, preserve_topology=True)
+    return {"path": path, "points": len(coordinates), "row": trail_row(line)}
+
+
+def trail_row(line):
+    # Valeurs d'une ligne de la table trails pour un INSERT Core (le listener ORM
+    # qui calcule métriques et niveaux n'est pas déclenché)
+    row = {"gpx": _to_ewkt(line), **compute_trail_metrics(line)}
+    for column, element in compute_trail_tiers(line).items():
+        row[column] = _to_ewkt(shapely.from_wkb(bytes(element.data)))
+    return row
+
+
+def _to_ewkt(geometry):
+    # Même représentation que celle envoyée par geoalchemy2 pour un from_shape (ST_GeogFromText)
+    return f"SRID=4326;{geometry.wkt}"
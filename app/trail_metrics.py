@@ -0,0 +1,52 @@
+from geoalchemy2.elements import WKBElement, WKTElement
+from geoalchemy2.shape import to_shape
+from shapely.geometry.base import BaseGeometry
+from app.trail_analytics import analyse_trail, trail_coordinates
+
+METRIC_COLUMNS = (
+    "distance",
+    "elevation_gain",
+    "elevation_loss",
+    "min_altitude",
+    "max_altitude",
+    "max_slope",
+    "bbox_west",
+    "bbox_south",
+    "bbox_east",
+    "bbox_north",
+    "start_lng",
+    "start_lat",
+)
+
+
+def load_line(gpx):
+    if gpx is None:
+        return None
+    if isinstance(gpx, BaseGeometry):
+        return gpx
+    if isinstance(gpx, (WKBElement, WKTElement)):
+        return to_shape(gpx)
+    # Chaîne WKT / EWKT assignée directement à la colonne
+    return to_shape(WKTElement(gpx))
+
+
+def empty_metrics():
+    return {column: None for column in METRIC_COLUMNS}
+
+
+def compute_trail_metrics(gpx):
+    line = load_line(gpx)
+    if line is None or line.is_empty:
+        return empty_metrics()
+
+    coordinates = trail_coordinates(line)
+    west, south, east, north = line.bounds
+    return {
+        **analyse_trail(coordinates),
+        "bbox_west": west,
+        "bbox_south": south,
+        "bbox_east": east,
+        "bbox_north": north,
+        "start_lng": float(coordinates[0, 0]),
+        "start_lat": float(coordinates[0, 1]),
+    }
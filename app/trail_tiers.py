@@ -0,0 +1,35 @@
+from geoalchemy2.shape import from_shape
+from app.trail_metrics import load_line
+
+# Niveaux de résolution stockés pour chaque tracé :
+# - tolerance : tolérance de simplification en degrés (~50 m et ~10 m)
+# - max_zoom : zoom carto maximal pour lequel le niveau reste lisible
+TIERS = {
+    "low": {"column": "gpx_low", "tolerance": 0.0005, "max_zoom": 11},
+    "medium": {"column": "gpx_medium", "tolerance": 0.0001, "max_zoom": 14},
+}
+
+
+def compute_trail_tiers(gpx):
+    line = load_line(gpx)
+    tiers = {}
+    for tier in TIERS.values():
+        if line is None or line.is_empty:
+            tiers[tier["column"]] = None
+        else:
+            simplified = line.simplify(tier["tolerance"], preserve_topology=True)
+            tiers[tier["column"]] = from_shape(simplified, srid=4326)
+    return tiers
+
+
+def select_tier(zoom=None, tolerance=None):
+    if zoom is not None:
+        for name, tier in sorted(TIERS.items(), key=lambda item: item[1]["max_zoom"]):
+            if zoom <= tier["max_zoom"]:
+                return name
+        return None
+    if tolerance is not None:
+        # Niveau stocké le plus simplifié qui respecte la tolérance demandée
+        candidates = [name for name, tier in TIERS.items() if tier["tolerance"] <= tolerance]
+        return max(candidates, key=lambda name: TIERS[name]["tolerance"]) if candidates else None
+    return None
@@ -0,0 +1,118 @@
+"""Latence et débit de chaque blueprint via le client de test Flask.
+
+Parcourt les routes GET de l'API (randonnées, tracés dans chaque format,
+avis, points de vue, zones, régions, parcours, tuiles) sur le catalogue
+généré par benchmarks.seed. Rate limiting et cache désactivés : chaque
+requête va jusqu'à la base. Nécessite la base locale (docker-compose) et ENV=dev.
+
+    python -m benchmarks.seed --reset
+    python -m benchmarks.bench_endpoints --requests 200
+"""
+import argparse
+import math
+import os
+import time
+
+# Avant l'import de l'app : la config est lue au chargement des modules
+os.environ.setdefault("RATELIMIT_ENABLED", "false")
+os.environ.setdefault("CACHE_BACKEND", "none")
+os.environ.setdefault("LOG_SAMPLE_RATE", "0")
+os.environ.setdefault("PROFILE_SAMPLE_RATE", "0")
+
+import numpy as np
+from sqlalchemy import text
+from app import create_app
+from app.database import Session
+from benchmarks.common import summarize, write_results
+
+TILE_ZOOM = 12
+
+ENDPOINTS = {
+    "hikes": "/api/hikes",
+    "hikes_fields": "/api/hikes?fields=id,name,distance",
+    "hike": "/api/hikes/{hike_id}",
+    "hike_zoom": "/api/hikes/{hike_id}?zoom=10",
+    "trail_geojson": "/api/hikes/{hike_id}/trail",
+    "trail_polyline": "/api/hikes/{hike_id}/trail?format=polyline",
+    "trail_delta": "/api/hikes/{hike_id}/trail?format=delta",
+    "trail_protobuf": "/api/hikes/{hike_id}/trail?format=protobuf",
+    "review_stats": "/api/hikes/{hike_id}/reviews/stats",
+    "reviews": "/api/reviews?hike_id={hike_id}",
+    "viewpoints": "/api/viewpoints?hike_id={hike_id}",
+    "zone": "/api/zones/{zone_id}",
+    "regions": "/api/regions",
+    "journeys": "/api/journeys",
+    "tile": "/api/tiles/{z}/{x}/{y}.mvt",
+}
+
+
+def tile_for(lng, lat, zoom):
+    n = 2 ** zoom
+    x = int((lng + 180) / 360 * n)
+    y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+    return x, y
+
+
+def sample_targets(rng, count):
+    # Identifiants tirés du catalogue, une cible par requête (toujours les mêmes pour une graine donnée)
+    with Session() as session:
+        hike_ids = session.scalars(text("SELECT id FROM hikes ORDER BY id")).all()
+        zones = session.execute(text(
+            "SELECT id, ST_X(location::geometry), ST_Y(location::geometry) FROM zones ORDER BY id"
+        )).all()
+    if not hike_ids or not zones:
+        raise SystemExit("empty catalogue, run python -m benchmarks.seed first")
+
+    targets = []
+    for _ in range(count):
+        zone_id, lng, lat = zones[rng.integers(len(zones))]
+        x, y = tile_for(lng, lat, TILE_ZOOM)
+        targets.append({
+            "hike_id": hike_ids[rng.integers(len(hike_ids))],
+            "zone_id": zone_id,
+            "z": TILE_ZOOM, "x": x, "y": y,
+        })
+    return targets
+
+
+def run(client, path, targets, warmup):
+    urls = [path.format(**target) for target in targets]
+    for url in urls[:warmup]:
+        client.get(url)
+
+    durations, errors = [], 0
+    started = time.perf_counter()
+    for url in urls:
+        start = time.perf_counter()
+        response = client.get(url)
+        response.get_data()
+        durations.append(time.perf_counter() - start)
+        errors += response.status_code != 200
+    elapsed = time.perf_counter() - started
+    return {
+        **summarize(durations),
+        "errors": errors,
+        "requests_per_s": round(len(urls) / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--requests", type=int, default=200, help="Requêtes par route")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    client = create_app().test_client()
+    targets = sample_targets(np.random.default_rng(args.seed), args.requests)
+    results = {}
+    for name in args.endpoints:
+        results[name] = run(client, ENDPOINTS[name], targets, args.warmup)
+        print(f"{name}: {results[name]['mean_ms']} ms, {results[name]['requests_per_s']} req/s")
+    write_results("endpoints", {"config": vars(args), "endpoints": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
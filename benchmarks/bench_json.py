@@ -0,0 +1,92 @@
+"""Coût de sérialisation JSON d'une liste de randonnées avec tracés complets.
+
+Compare le fournisseur JSON par défaut de Flask (coordonnées converties en
+listes Python, comportement historique) au fournisseur NumPy et à orjson
+(coordonnées sérialisées directement depuis le tableau de get_coordinates).
+Ne nécessite pas de base de données.
+
+    python -m benchmarks.bench_json --hikes 200 --points 5000
+"""
+import argparse
+import time
+import numpy as np
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from benchmarks.common import make_track, summarize, write_results
+from app.json_provider import NumpyJSONProvider, OrjsonProvider
+
+
+def make_hikes(count, points, seed=0):
+    rng = np.random.default_rng(seed)
+    hikes = []
+    for hike_id in range(1, count + 1):
+        coordinates = make_track(rng, points, start=(55.2, -21.1))
+        hikes.append({
+            "id": hike_id,
+            "name": f"Randonnée {hike_id}",
+            "distance": 12.4,
+            "elevation": 850,
+            "difficulty": 3,
+            "duration": 300,
+            "description": "Lorem ipsum " * 20,
+            "journey": {"id": 1, "name": "Boucle"},
+            "region": {"id": 1, "name": "Sud"},
+            "trail": {
+                "id": hike_id,
+                "geojson": {
+                    "type": "FeatureCollection",
+                    "features": [{
+                        "type": "Feature",
+                        "geometry": {"type": "LineString", "coordinates": coordinates},
+                        "properties": {"attributeType": "Elevation"},
+                    }],
+                    "properties": {"summary": "Simaps"},
+                },
+            },
+        })
+    return hikes
+
+
+def as_lists(hikes):
+    # Ancien chemin de define_geojson : coordonnées converties avec .tolist()
+    payload = []
+    for hike in hikes:
+        geojson = hike["trail"]["geojson"]
+        feature = geojson["features"][0]
+        geometry = {**feature["geometry"], "coordinates": feature["geometry"]["coordinates"].tolist()}
+        trail = {**hike["trail"], "geojson": {**geojson, "features": [{**feature, "geometry": geometry}]}}
+        payload.append({**hike, "trail": trail})
+    return payload
+
+
+def run(provider_class, hikes, prepare, repeat):
+    app = Flask(__name__)
+    app.json = provider_class(app)
+    durations, size = [], 0
+    with app.app_context():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            size = len(app.json.response(prepare(hikes)).get_data())
+            durations.append(time.perf_counter() - start)
+    return {"bytes": size, "latency": summarize(durations)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hikes", type=int, default=200)
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    hikes = make_hikes(args.hikes, args.points)
+    results = {
+        "default_tolist": run(DefaultJSONProvider, hikes, as_lists, args.repeat),
+        "numpy_default": run(NumpyJSONProvider, hikes, lambda payload: payload, args.repeat),
+        "orjson_numpy": run(OrjsonProvider, hikes, lambda payload: payload, args.repeat),
+    }
+    write_results("json", {"config": vars(args), "providers": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
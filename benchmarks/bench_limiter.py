@@ -0,0 +1,72 @@
+"""Surcoût par requête du rate limiting selon le stockage des compteurs.
+
+Mesure une route triviale via le client de test Flask, sans limiter puis avec
+chaque stockage. postgresql+batched:// (avec et sans regroupement des
+incréments) nécessite la base et la table rate_limits (migrations/008).
+
+    python -m benchmarks.bench_limiter --requests 2000
+    python -m benchmarks.bench_limiter --storages none memory postgres postgres-unbatched
+"""
+import argparse
+import time
+from flask import Flask
+from flask_limiter import Limiter
+from benchmarks.common import summarize, write_results
+# Enregistre le schéma postgresql+batched://
+from app.limiter_storage import BatchedPostgresStorage
+
+STORAGES = {
+    "none": None,
+    "memory": ("memory://", {}),
+    "postgres": ("postgresql+batched://", {"batch_size": 20, "flush_interval": 1.0}),
+    "postgres-unbatched": ("postgresql+batched://", {"batch_size": 1, "flush_interval": 0}),
+}
+
+
+def make_app(storage):
+    app = Flask(__name__)
+
+    if storage is None:
+        @app.route("/ping")
+        def ping():
+            return "pong"
+        return app, None
+
+    storage_uri, options = storage
+    limiter = Limiter(key_func=lambda: "bench", storage_uri=storage_uri, storage_options=options)
+    limiter.init_app(app)
+
+    @app.route("/ping")
+    @limiter.limit("1000000 per hour")
+    def ping():
+        return "pong"
+    return app, limiter
+
+
+def run(storage, requests):
+    app, limiter = make_app(storage)
+    if limiter is not None:
+        limiter.reset()
+    client = app.test_client()
+    durations = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get("/ping")
+        durations.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.status_code
+    return summarize(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--storages", nargs="+", choices=list(STORAGES), default=["none", "memory"])
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = {name: run(STORAGES[name], args.requests) for name in args.storages}
+    write_results("limiter", {"config": vars(args), "storages": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Micro-benchmarks de sérialisation et de calcul des tracés (sans base de données).
+
+- Hike.to_dict / Hike.to_summary_dict sur des objets ORM en mémoire
+- Trail.define_geojson (décodage WKB -> coordonnées NumPy)
+- distance et dénivelé du tracé (compute_trail_metrics, cumulative_distance)
+
+    python -m benchmarks.bench_models --points 500 5000 --repeat 200
+"""
+import argparse
+import time
+import numpy as np
+from geoalchemy2.shape import from_shape
+from shapely import LineString
+from app.models import Hike, Trail, Journey, Region, ReviewStats
+from app.trail_analytics import cumulative_distance, trail_coordinates
+from app.trail_metrics import compute_trail_metrics
+from benchmarks.common import make_track, summarize, write_results
+
+
+def make_hike(rng, points):
+    line = LineString(make_track(rng, points))
+    trail = Trail(id=1, gpx=from_shape(line, srid=4326))
+    trail.refresh_metrics()
+    hike = Hike(
+        id=1, name="Randonnée", distance=12.0, elevation=800, difficulty=3, duration=300,
+        description="Lorem ipsum " * 20,
+        journey=Journey(id=1, name="Boucle"),
+        region=Region(id=1, name="Sud"),
+        review_stats=ReviewStats(count=10, rate_sum=42),
+        trail=trail,
+    )
+    return hike, line
+
+
+def measure(function, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+
+def run(points, repeat, seed):
+    hike, line = make_hike(np.random.default_rng(seed), points)
+    coordinates = trail_coordinates(line)
+    return {
+        "hike_to_dict": measure(hike.to_dict, repeat),
+        "hike_to_summary_dict": measure(hike.to_summary_dict, repeat),
+        "trail_define_geojson": measure(hike.trail.define_geojson, repeat),
+        "trail_metrics": measure(lambda: compute_trail_metrics(line), repeat),
+        "cumulative_distance": measure(lambda: cumulative_distance(coordinates), repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, nargs="+", default=[500, 5000])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = {str(points): run(points, args.repeat, args.seed) for points in args.points}
+    write_results("models", {"config": vars(args), "points": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
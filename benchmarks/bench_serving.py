@@ -0,0 +1,117 @@
+"""Débit du serveur gunicorn selon le type de worker (sync / gthread / gevent).
+
+Lance gunicorn pour chaque mode, puis envoie des requêtes concurrentes sur la
+liste des randonnées et des avis. Nécessite la base locale (docker-compose)
+et ENV=dev.
+
+    python -m benchmarks.bench_serving --modes sync gevent --concurrency 50 --duration 20
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.common import summarize, write_results
+
+ENDPOINTS = {
+    "hikes": "/api/hikes",
+    "reviews": "/api/reviews",
+}
+
+MODES = {
+    "sync": {"GUNICORN_WORKER_CLASS": "sync"},
+    "gthread": {"GUNICORN_WORKER_CLASS": "gthread", "GUNICORN_THREADS": "8"},
+    "gevent": {"GUNICORN_WORKER_CLASS": "gevent", "GUNICORN_WORKER_CONNECTIONS": "200", "DB_POOL_SIZE": "20"},
+}
+
+
+def start_server(mode, port, workers):
+    env = {
+        **os.environ,
+        **MODES[mode],
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+        "GUNICORN_WORKERS": str(workers),
+        # Le rate limiting et le cache fausseraient la mesure
+        "RATELIMIT_ENABLED": "false",
+        "CACHE_BACKEND": "none",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:create_app()"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/api/regions", timeout=1)
+            return server
+        except OSError:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError(f"gunicorn ({mode}) did not start")
+
+
+def fetch(url):
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            response.read()
+            ok = response.status == 200
+    except OSError:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def load(url, concurrency, duration):
+    durations, errors = [], 0
+    deadline = time.time() + duration
+
+    def worker():
+        local, failed = [], 0
+        while time.time() < deadline:
+            elapsed, ok = fetch(url)
+            local.append(elapsed)
+            failed += not ok
+        return local, failed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for local, failed in executor.map(lambda _: worker(), range(concurrency)):
+            durations.extend(local)
+            errors += failed
+    wall = time.perf_counter() - started
+    return {
+        "throughput_rps": round(len(durations) / wall, 1),
+        "errors": errors,
+        "latency": summarize(durations),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=["sync", "gevent"], choices=sorted(MODES))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = {}
+    for mode in args.modes:
+        server = start_server(mode, args.port, args.workers)
+        try:
+            results[mode] = {
+                name: load(f"http://127.0.0.1:{args.port}{path}", args.concurrency, args.duration)
+                for name, path in ENDPOINTS.items()
+            }
+        finally:
+            server.terminate()
+            server.wait()
+
+    write_results("serving", {"config": vars(args), "modes": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Temps de démarrage d'un processus (import, create_app, premier usage du moteur).
+
+Chaque mesure est faite dans un nouvel interpréteur, comme un worker qui démarre
+à froid. Les secrets, le moteur et Firebase étant initialisés à la demande,
+create_app ne fait plus d'appel réseau. En prod (ENV=prod), l'étape `engine`
+inclut la récupération du secret PostgreSQL.
+
+    python -m benchmarks.bench_startup --runs 10
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from benchmarks.common import summarize, write_results
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+flask_app = app.create_app()
+created = time.perf_counter()
+from app.database import get_engine
+get_engine()
+engine = time.perf_counter()
+print(json.dumps({"import": imported - start, "create_app": created - imported, "engine": engine - created}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    stages = {"import": [], "create_app": [], "engine": [], "process": []}
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        output = subprocess.check_output([sys.executable, "-c", PROBE], text=True, stderr=subprocess.DEVNULL)
+        stages["process"].append(time.perf_counter() - start)
+        timings = json.loads(output.strip().splitlines()[-1])
+        for stage, duration in timings.items():
+            stages[stage].append(duration)
+
+    results = {stage: summarize(durations) for stage, durations in stages.items()}
+    write_results("startup", {"config": vars(args), "stages": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
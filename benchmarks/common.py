@@ -0,0 +1,56 @@
+import datetime as dt
+import json
+import os
+import platform
+import subprocess
+import numpy as np
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def make_track(rng, points, start=(55.5, -21.1)):
+    # Marche aléatoire (lng, lat, altitude) autour d'un point de départ
+    return np.column_stack((
+        start[0] + np.cumsum(rng.normal(0, 1e-4, points)),
+        start[1] + np.cumsum(rng.normal(0, 1e-4, points)),
+        1000 + np.cumsum(rng.normal(0, 1, points)),
+    ))
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(durations):
+    # Durées en secondes -> statistiques en millisecondes
+    if not len(durations):
+        return {"count": 0}
+    values = np.asarray(durations) * 1000
+    return {
+        "count": int(len(values)),
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+
+def write_results(name, results, output=None):
+    payload = {
+        "benchmark": name,
+        "revision": git_revision(),
+        "date": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{name}-{payload['revision'] or 'local'}.json")
+    with open(output, "w") as f:
+        json.dump(payload, f, indent=2)
+    print(json.dumps(payload, indent=2))
+    return output
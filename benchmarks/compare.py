@@ -0,0 +1,74 @@
+"""Compare deux fichiers de résultats (deux commits) et signale les régressions.
+
+Rapproche les mesures de même chemin (ex. endpoints/hike) et affiche
+l'évolution de leur latence. Code de sortie 1 si une mesure se dégrade de
+plus de --threshold %.
+
+    git checkout main && python -m benchmarks.bench_models
+    git checkout ma-branche && python -m benchmarks.bench_models
+    python -m benchmarks.compare benchmarks/results/models-<rev1>.json benchmarks/results/models-<rev2>.json
+"""
+import argparse
+import json
+import sys
+
+METRICS = ("mean_ms", "p95_ms")
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def measurements(results, path=()):
+    # Feuilles produites par common.summarize, indexées par leur chemin
+    if isinstance(results, dict):
+        if "mean_ms" in results:
+            yield "/".join(path), results
+            return
+        for key, value in results.items():
+            if key != "config":
+                yield from measurements(value, path + (key,))
+
+
+def compare(baseline, candidate, metric, threshold):
+    before = dict(measurements(baseline["results"]))
+    after = dict(measurements(candidate["results"]))
+    regressions = []
+    width = max((len(name) for name in before), default=0)
+    print(f"{'':{width}}  {baseline['revision'] or 'baseline':>10}  {candidate['revision'] or 'candidate':>10}  {'delta':>8}")
+    for name, old in before.items():
+        new = after.get(name)
+        if new is None or not old.get(metric):
+            continue
+        delta = (new[metric] - old[metric]) / old[metric] * 100
+        flag = ""
+        if delta > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:{width}}  {old[metric]:>10.3f}  {new[metric]:>10.3f}  {delta:>+7.1f}%{flag}")
+    for name in after.keys() - before.keys():
+        print(f"{name:{width}}  {'-':>10}  {after[name][metric]:>10.3f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", choices=METRICS, default="p95_ms")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Dégradation tolérée (%%)")
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    if baseline["benchmark"] != candidate["benchmark"]:
+        parser.error(f"cannot compare {baseline['benchmark']} with {candidate['benchmark']}")
+
+    regressions = compare(baseline, candidate, args.metric, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Catalogue synthétique reproductible pour les benchmarks.
+
+Insère N zones / régions / parcours, M randonnées avec leurs tracés (nombre
+de points configurable, métriques et niveaux de simplification calculés
+comme à l'écriture), des avis et des points de vue. Même graine => mêmes
+données. À lancer sur la base locale (docker-compose, ENV=dev) :
+
+    python -m benchmarks.seed --reset --hikes 500 --points 2000
+"""
+import argparse
+import glob
+import os
+import time
+import numpy as np
+from shapely import LineString
+from sqlalchemy import insert, text
+from app.config import env
+from app.commands import REBUILD_REVIEW_STATS
+from app.database import Base, Session, get_engine
+from app.models import Zone, Region, Journey, Trail, Hike, Review, Viewpoint
+from app.trail_import import trail_row
+from benchmarks.common import make_track
+
+# Emprise de La Réunion (lng / lat)
+BOUNDS = (55.22, -21.38, 55.83, -20.87)
+TABLES = ("hike_review_stats", "reviews", "viewpoints", "hikes", "trails", "zones", "regions", "journeys")
+BATCH_SIZE = 200
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+
+def random_point(rng):
+    west, south, east, north = BOUNDS
+    return float(rng.uniform(west, east)), float(rng.uniform(south, north))
+
+
+def point_ewkt(rng):
+    return "SRID=4326;POINT(%f %f)" % random_point(rng)
+
+
+def insert_rows(session, model, rows):
+    ids = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        ids += session.scalars(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            rows[start:start + BATCH_SIZE]
+        ).all()
+    return ids
+
+
+def create_schema():
+    # Tables des modèles, puis migrations/*.sql dans l'ordre : table_versions et ses triggers
+    # (lue par chaque GET conditionnel), rate_limits, index d'expression... que
+    # create_all ne connaît pas. Les migrations sont idempotentes.
+    engine = get_engine()
+    with engine.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+    Base.metadata.create_all(engine)
+    for path in sorted(glob.glob(os.path.join(MIGRATIONS_DIR, "*.sql"))):
+        with open(path) as f, engine.begin() as connection:
+            # Script brut (blocs DO, format('%I')) : pas d'interpolation de paramètres
+            connection.execution_options(no_parameters=True).exec_driver_sql(f.read())
+        print(f"Applied {os.path.basename(path)}")
+
+
+def seed(args):
+    rng = np.random.default_rng(args.seed)
+    with Session() as session:
+        if args.reset:
+            session.execute(text(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE"))
+
+        zone_ids = insert_rows(session, Zone, [
+            {"name": f"Zone {i}", "location": point_ewkt(rng)}
+            for i in range(1, args.zones + 1)
+        ])
+        region_ids = insert_rows(session, Region, [{"name": f"Région {i}"} for i in range(1, args.regions + 1)])
+        journey_ids = insert_rows(session, Journey, [{"name": f"Parcours {i}"} for i in range(1, args.journeys + 1)])
+
+        trail_ids = insert_rows(session, Trail, [
+            trail_row(LineString(make_track(rng, args.points, start=random_point(rng))))
+            for _ in range(args.hikes)
+        ])
+        hike_ids = insert_rows(session, Hike, [
+            {
+                "name": f"Randonnée {i}",
+                "distance": float(rng.uniform(2, 25)),
+                "elevation": int(rng.integers(50, 2000)),
+                "difficulty": int(rng.integers(1, 6)),
+                "duration": int(rng.integers(60, 600)),
+                "description": "Lorem ipsum dolor sit amet. " * 10,
+                "zone_id": int(rng.choice(zone_ids)),
+                "region_id": int(rng.choice(region_ids)),
+                "journey_id": int(rng.choice(journey_ids)),
+                "trail_id": trail_id,
+            }
+            for i, trail_id in enumerate(trail_ids, start=1)
+        ])
+
+        insert_rows(session, Review, [
+            {
+                "title": f"Avis {i}",
+                "note": "Très belle randonnée. " * 5,
+                "rate": int(rng.integers(1, 6)),
+                "is_validated": bool(rng.random() < 0.8),
+                "hike_id": hike_id,
+            }
+            for hike_id in hike_ids for i in range(args.reviews)
+        ])
+        insert_rows(session, Viewpoint, [
+            {
+                "name": f"Point de vue {i}",
+                "location": point_ewkt(rng),
+                "hike_id": hike_id,
+            }
+            for hike_id in hike_ids for i in range(args.viewpoints)
+        ])
+
+        session.execute(text("DELETE FROM hike_review_stats"))
+        session.execute(text(REBUILD_REVIEW_STATS))
+        session.commit()
+    return {"zones": len(zone_ids), "hikes": len(hike_ids)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--zones", type=int, default=10)
+    parser.add_argument("--regions", type=int, default=5)
+    parser.add_argument("--journeys", type=int, default=3)
+    parser.add_argument("--hikes", type=int, default=200)
+    parser.add_argument("--points", type=int, default=2000, help="Points par tracé")
+    parser.add_argument("--reviews", type=int, default=10, help="Avis par randonnée")
+    parser.add_argument("--viewpoints", type=int, default=3, help="Points de vue par randonnée")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reset", action="store_true", help="Vide les tables du catalogue avant l'insertion")
+    parser.add_argument("--create-schema", action="store_true", help="Crée les tables manquantes et applique migrations/*.sql (base vierge)")
+    args = parser.parse_args()
+
+    if env != "dev":
+        parser.error("the seed only runs against the local database (ENV=dev)")
+    if args.create_schema:
+        create_schema()
+
+    start = time.perf_counter()
+    counts = seed(args)
+    print(f"Seeded {counts['hikes']} hikes in {counts['zones']} zones in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import os
+import sys
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8080")
+workers = int(os.environ.get("GUNICORN_WORKERS", 4))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+preload_app = os.environ.get("GUNICORN_PRELOAD", "false").lower() == "true"
+
+# Mode de service : sync (défaut), gthread ou gevent (haute concurrence, I/O PostgreSQL / Firebase)
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 100))
+
+# Secrets récupérés et warm-up dans chaque worker, avant la première requête. Le master
+# n'importe rien de app : ni module, ni verrou, ni canal gRPC créés avant le fork
+# et avant le monkey patching gevent (sans effet avec GUNICORN_PRELOAD=true)
+prefetch_secrets = os.environ.get("GUNICORN_PREFETCH_SECRETS", "true").lower() == "true"
+warm_up_workers = os.environ.get("GUNICORN_WARM_UP", "true").lower() == "true"
+
+
+def post_fork(server, worker):
+    # Avec preload_app, le moteur SQLAlchemy a été créé dans le master :
+    # chaque worker repart d'un pool vide pour ne pas partager de sockets
+    database = sys.modules.get("app.database")
+    if database is not None:
+        database.dispose_engine()
+
+
+def post_worker_init(worker):
+    # Appelé après monkey.patch_all() (GeventWorker.init_process), que
+    # init_gevent() de gRPC suppose déjà fait ; post_fork passe avant le patch
+    if worker_class == "gevent":
+        _make_io_cooperative()
+
+    # Secrets, moteur, pool et application Firebase prêts avant la première requête
+    if prefetch_secrets:
+        from app.startup import prefetch
+        prefetch()
+    if warm_up_workers:
+        from app.startup import warm_up
+        warm_up()
+
+
+def _make_io_cooperative():
+    # psycopg2 et gRPC (Secret Manager) ne passent pas par les sockets
+    # patchés par gevent : on les rend coopératifs explicitement
+    from psycogreen.gevent import patch_psycopg
+    import grpc.experimental.gevent as grpc_gevent
+
+    patch_psycopg()
+    grpc_gevent.init_gevent()
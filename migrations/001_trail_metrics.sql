@@ -0,0 +1,12 @@
+-- Métriques dérivées des tracés (cf. app/trail_metrics.py)
+-- Remplissage des lignes existantes : flask --app run trails backfill
+ALTER TABLE trails
+    ADD COLUMN IF NOT EXISTS distance double precision,
+    ADD COLUMN IF NOT EXISTS elevation_gain double precision,
+    ADD COLUMN IF NOT EXISTS elevation_loss double precision,
+    ADD COLUMN IF NOT EXISTS min_altitude double precision,
+    ADD COLUMN IF NOT EXISTS max_altitude double precision,
+    ADD COLUMN IF NOT EXISTS bbox_west double precision,
+    ADD COLUMN IF NOT EXISTS bbox_south double precision,
+    ADD COLUMN IF NOT EXISTS bbox_east double precision,
+    ADD COLUMN IF NOT EXISTS bbox_north double precision;
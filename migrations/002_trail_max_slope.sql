@@ -0,0 +1,4 @@
+-- Pente maximale du tracé (cf. app/trail_analytics.py)
+-- Recalcul des lignes existantes : flask --app run trails backfill --all
+ALTER TABLE trails
+    ADD COLUMN IF NOT EXISTS max_slope double precision;
@@ -0,0 +1,5 @@
+-- Point de départ du tracé, utilisé par la vue liste des randonnées
+-- Recalcul des lignes existantes : flask --app run trails backfill --all
+ALTER TABLE trails
+    ADD COLUMN IF NOT EXISTS start_lng double precision,
+    ADD COLUMN IF NOT EXISTS start_lat double precision;
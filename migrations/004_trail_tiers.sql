@@ -0,0 +1,5 @@
+-- Niveaux de simplification des tracés (cf. app/trail_tiers.py)
+-- Calcul des lignes existantes : flask --app run trails backfill
+ALTER TABLE trails
+    ADD COLUMN IF NOT EXISTS gpx_low geography,
+    ADD COLUMN IF NOT EXISTS gpx_medium geography;
@@ -0,0 +1,4 @@
+-- Index GiST des colonnes géographiques (filtres bbox / near / nearest)
+CREATE INDEX IF NOT EXISTS idx_trails_gpx ON trails USING GIST (gpx);
+CREATE INDEX IF NOT EXISTS idx_zones_location ON zones USING GIST (location);
+CREATE INDEX IF NOT EXISTS idx_viewpoints_location ON viewpoints USING GIST (location);
@@ -0,0 +1,5 @@
+-- Horodatage des modifications, utilisé pour les ETag / Last-Modified (cf. app/conditional.py)
+ALTER TABLE hikes ADD COLUMN IF NOT EXISTS updated_at timestamptz NOT NULL DEFAULT now();
+ALTER TABLE trails ADD COLUMN IF NOT EXISTS updated_at timestamptz NOT NULL DEFAULT now();
+ALTER TABLE reviews ADD COLUMN IF NOT EXISTS updated_at timestamptz NOT NULL DEFAULT now();
+ALTER TABLE viewpoints ADD COLUMN IF NOT EXISTS updated_at timestamptz NOT NULL DEFAULT now();
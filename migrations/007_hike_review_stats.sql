@@ -0,0 +1,22 @@
+-- Agrégats des avis validés par randonnée (maintenus par app/services/review_service.py)
+-- Recalcul complet : flask --app run reviews rebuild-stats
+CREATE TABLE IF NOT EXISTS hike_review_stats (
+    hike_id integer PRIMARY KEY REFERENCES hikes (id) ON DELETE CASCADE,
+    count integer NOT NULL DEFAULT 0,
+    rate_sum integer NOT NULL DEFAULT 0,
+    rate_1 integer NOT NULL DEFAULT 0,
+    rate_2 integer NOT NULL DEFAULT 0,
+    rate_3 integer NOT NULL DEFAULT 0,
+    rate_4 integer NOT NULL DEFAULT 0,
+    rate_5 integer NOT NULL DEFAULT 0,
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+INSERT INTO hike_review_stats (hike_id, count, rate_sum, rate_1, rate_2, rate_3, rate_4, rate_5)
+SELECT hike_id, count(*), coalesce(sum(rate), 0),
+       count(*) FILTER (WHERE rate = 1), count(*) FILTER (WHERE rate = 2), count(*) FILTER (WHERE rate = 3),
+       count(*) FILTER (WHERE rate = 4), count(*) FILTER (WHERE rate = 5)
+FROM reviews
+WHERE is_validated
+GROUP BY hike_id
+ON CONFLICT (hike_id) DO NOTHING;
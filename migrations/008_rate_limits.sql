@@ -0,0 +1,9 @@
+-- Compteurs de rate limiting partagés entre workers (RATELIMIT_STORAGE_URI=postgresql+batched://)
+-- Table UNLOGGED : données éphémères, pas de WAL
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limits (
+    key text PRIMARY KEY,
+    count integer NOT NULL,
+    expires_at timestamptz NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_rate_limits_expires_at ON rate_limits (expires_at);
@@ -0,0 +1,47 @@
+-- Version par table pour les ETag / Last-Modified (cf. app/services/version_service.py)
+-- Incrémentée par un trigger d'instruction sur toute écriture, y compris les DELETE,
+-- TRUNCATE et les UPDATE en SQL brut / Core qui ne passent pas par l'ORM
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name text PRIMARY KEY,
+    version bigint NOT NULL DEFAULT 0,
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO table_versions (table_name, version, updated_at)
+    VALUES (TG_TABLE_NAME, 1, now())
+    ON CONFLICT (table_name) DO UPDATE SET
+        version = table_versions.version + 1,
+        updated_at = now();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- updated_at posé par la base sur chaque UPDATE, quel que soit le client
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    target text;
+BEGIN
+    FOREACH target IN ARRAY ARRAY['hikes', 'trails', 'reviews', 'viewpoints', 'hike_review_stats',
+                                'zones', 'regions', 'journeys'] LOOP
+        INSERT INTO table_versions (table_name) VALUES (target) ON CONFLICT DO NOTHING;
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', target || '_version', target);
+        EXECUTE format('CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I
+                        FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()', target || '_version', target);
+    END LOOP;
+
+    FOREACH target IN ARRAY ARRAY['hikes', 'trails', 'reviews', 'viewpoints', 'hike_review_stats'] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', target || '_updated_at', target);
+        EXECUTE format('CREATE TRIGGER %I BEFORE UPDATE ON %I
+                        FOR EACH ROW EXECUTE FUNCTION set_updated_at()', target || '_updated_at', target);
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,5 @@
+-- Index GiST sur la géométrie planaire des colonnes geography, pour le filtre
+-- des tuiles vectorielles (ST_Intersects(col::geometry, emprise 4326))
+CREATE INDEX IF NOT EXISTS idx_trails_gpx_geometry ON trails USING GIST ((gpx::geometry));
+CREATE INDEX IF NOT EXISTS idx_zones_location_geometry ON zones USING GIST ((location::geometry));
+CREATE INDEX IF NOT EXISTS idx_viewpoints_location_geometry ON viewpoints USING GIST ((location::geometry));
@@ -0,0 +1,150 @@
+from contextlib import contextmanager
+import pytest
+from sqlalchemy.exc import OperationalError
+from app import limiter_storage
+from app.limiter_storage import BatchedPostgresStorage, UPSERT_COUNTER, SELECT_COUNTER, DELETE_EXPIRED
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+class FakeResult:
+    def __init__(self, row):
+        self.row = row
+
+    def one(self):
+        return self.row
+
+    def first(self):
+        return self.row
+
+
+class FakeDatabase:
+    # Table rate_limits simulée : même sémantique que UPSERT_COUNTER / SELECT_COUNTER
+    def __init__(self, clock):
+        self.clock = clock
+        self.rows = {}
+        self.upserts = 0
+        self.failing = False
+
+    def execute(self, statement, parameters=None):
+        if self.failing:
+            raise OperationalError(str(statement), parameters, Exception("connection refused"))
+        now = self.clock.now
+        if statement is UPSERT_COUNTER:
+            self.upserts += 1
+            key = parameters["key"]
+            count, expires_at = self.rows.get(key, (0, 0.0))
+            if expires_at <= now:
+                count, expires_at = 0, now + parameters["expiry"]
+            self.rows[key] = (count + parameters["amount"], expires_at)
+            return FakeResult(self.rows[key])
+        if statement is SELECT_COUNTER:
+            row = self.rows.get(parameters["key"])
+            return FakeResult(row if row and row[1] > now else None)
+        if statement is DELETE_EXPIRED:
+            self.rows = {key: row for key, row in self.rows.items() if row[1] > now}
+        return FakeResult(None)
+
+    @contextmanager
+    def begin(self):
+        yield self
+
+    connect = begin
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(limiter_storage, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def database(clock, monkeypatch):
+    database = FakeDatabase(clock)
+    monkeypatch.setattr(BatchedPostgresStorage, "_engine", staticmethod(lambda: database))
+    return database
+
+
+def make_storage(batch_size=5, flush_interval=1.0):
+    return BatchedPostgresStorage("postgresql+batched://", batch_size=batch_size, flush_interval=flush_interval)
+
+
+def test_first_hit_is_flushed_then_batched(database, clock):
+    storage = make_storage(batch_size=5)
+    assert storage.incr("ip", 60) == 1
+    assert database.upserts == 1
+    for expected in range(2, 6):
+        assert storage.incr("ip", 60) == expected
+    assert database.upserts == 1
+    # Cinquième hit en attente : le lot est envoyé
+    assert storage.incr("ip", 60) == 6
+    assert database.upserts == 2
+    assert database.rows["ip"][0] == 6
+
+
+def test_flush_interval_sends_pending_hits(database, clock):
+    storage = make_storage(batch_size=100, flush_interval=1.0)
+    storage.incr("ip", 60)
+    storage.incr("ip", 60)
+    assert database.upserts == 1
+    clock.now += 1.5
+    assert storage.incr("ip", 60) == 3
+    assert database.upserts == 2
+    assert database.rows["ip"][0] == 3
+
+
+def test_hits_from_other_workers_are_seen(database, clock):
+    first, second = make_storage(), make_storage()
+    first.incr("ip", 60)
+    assert second.incr("ip", 60) == 2
+    assert first.get("ip") == 1
+    assert second.get("ip") == 2
+
+
+def test_window_restarts_after_expiry(database, clock):
+    storage = make_storage()
+    storage.incr("ip", 60)
+    storage.incr("ip", 60)
+    clock.now += 61
+    assert storage.incr("ip", 60) == 1
+    assert database.rows["ip"][0] == 1
+
+
+def test_failed_flush_keeps_pending_hits(database, clock):
+    storage = make_storage(batch_size=2)
+    storage.incr("ip", 60)
+    storage.incr("ip", 60)
+    database.failing = True
+    # L'erreur remonte (le limiter bascule alors sur ses compteurs en mémoire)
+    with pytest.raises(OperationalError):
+        storage.incr("ip", 60)
+    assert storage.check() is False
+    database.failing = False
+    clock.now += 1.5
+    assert storage.incr("ip", 60) == 4
+    assert database.rows["ip"][0] == 4
+
+
+def test_cleanup_prunes_expired_local_counters(database, clock):
+    storage = make_storage()
+    storage.incr("old", 10)
+    storage.incr("daily", 86400)
+    clock.now += limiter_storage.CLEANUP_INTERVAL + 1
+    storage.incr("new", 60)
+    assert set(storage.counters) == {"daily", "new"}
+    assert set(database.rows) == {"daily", "new"}
+
+
+def test_get_and_expiry_fall_back_to_database(database, clock):
+    storage = make_storage()
+    assert storage.get("ip") == 0
+    make_storage().incr("ip", 60)
+    assert storage.get("ip") == 1
+    assert storage.get_expiry("ip") == clock.now + 60
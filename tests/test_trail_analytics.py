@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+from pyproj import Geod
+from shapely import LineString, get_coordinates
+from app.trail_analytics import cumulative_distance, elevation_changes, analyse_trail, smooth_altitudes
+from app.trail_metrics import compute_trail_metrics
+
+
+def make_track(seed, points):
+    # Marche aléatoire autour de La Réunion, altitudes en dents de scie
+    rng = np.random.default_rng(seed)
+    lng = 55.5 + np.cumsum(rng.normal(0, 1e-4, points))
+    lat = -21.1 + np.cumsum(rng.normal(0, 1e-4, points))
+    ele = 500 + np.cumsum(rng.normal(0, 5, points))
+    return LineString(np.column_stack((lng, lat, ele)))
+
+
+TRACKS = [
+    LineString([(55.5, -21.1, 100), (55.501, -21.1, 110), (55.502, -21.101, 90)]),
+    make_track(1, 11),
+    make_track(2, 250),
+    make_track(3, 5001),
+]
+
+
+# Implémentations scalaires d'origine (Hike.get_geojson_distance / get_geojson_elevation)
+
+def scalar_distance(line):
+    return Geod(ellps="WGS84").geometry_length(line)
+
+
+def scalar_elevation_gain(line):
+    coordinates = get_coordinates(line, include_z=True).tolist()
+    total_elevation = 0
+    for x in range(0, len(coordinates) - 10, 10):
+        if coordinates[x + 10][2] > coordinates[x][2]:
+            total_elevation += coordinates[x + 10][2] - coordinates[x][2]
+    return total_elevation
+
+
+def scalar_elevation_changes(altitudes, step, threshold):
+    # Hystérésis point par point : la référence ne bouge qu'une fois le seuil franchi
+    gain = loss = 0.0
+    reference = None
+    for altitude in altitudes[::step]:
+        if reference is None:
+            reference = altitude
+        elif altitude - reference >= threshold:
+            gain += altitude - reference
+            reference = altitude
+        elif reference - altitude >= threshold:
+            loss += reference - altitude
+            reference = altitude
+    return gain, loss
+
+
+@pytest.mark.parametrize("line", TRACKS)
+def test_cumulative_distance_matches_geod(line):
+    distances = cumulative_distance(get_coordinates(line, include_z=True))
+    assert distances[0] == 0
+    assert np.all(np.diff(distances) >= 0)
+    assert distances[-1] == pytest.approx(scalar_distance(line), rel=1e-9)
+
+
+def test_cumulative_distance_short_tracks():
+    assert cumulative_distance(np.empty((0, 3))).tolist() == []
+    assert cumulative_distance(np.array([[55.5, -21.1, 0.0]])).tolist() == [0.0]
+
+
+@pytest.mark.parametrize("line", TRACKS)
+def test_elevation_gain_matches_scalar(line):
+    altitudes = get_coordinates(line, include_z=True)[:, 2]
+    gain, _ = elevation_changes(altitudes)
+    assert gain == pytest.approx(scalar_elevation_gain(line))
+
+
+@pytest.mark.parametrize("line", TRACKS)
+@pytest.mark.parametrize("step, threshold", [(1, 0.0), (1, 3.0), (10, 5.0), (5, 50.0)])
+def test_elevation_deadband_matches_scalar(line, step, threshold):
+    altitudes = get_coordinates(line, include_z=True)[:, 2]
+    gain, loss = elevation_changes(altitudes, step, threshold)
+    expected_gain, expected_loss = scalar_elevation_changes(altitudes.tolist(), step, threshold)
+    assert gain == pytest.approx(expected_gain)
+    assert loss == pytest.approx(expected_loss)
+
+
+def test_elevation_deadband_keeps_steady_climb():
+    # 1000 m de montée régulière par pas de 1 m : chaque échantillon reste sous le seuil
+    altitudes = np.linspace(0, 1000, 10001)
+    gain, loss = elevation_changes(altitudes, step=10, threshold=2.0)
+    assert gain == pytest.approx(1000)
+    assert loss == 0
+
+
+def test_elevation_deadband_ignores_noise():
+    altitudes = np.array([100.0, 101.5, 99.0, 100.5, 98.8, 101.0, 110.0, 108.5, 111.0, 100.0])
+    assert elevation_changes(altitudes, step=1, threshold=3.0) == (10.0, 10.0)
+
+
+def test_elevation_loss_is_never_negative_zero():
+    _, loss = elevation_changes(np.linspace(0, 100, 50), step=1)
+    assert loss == 0 and np.copysign(1, loss) == 1
+
+
+def test_elevation_without_altitude():
+    line = LineString([(55.5 + i * 1e-3, -21.1) for i in range(30)])
+    metrics = analyse_trail(get_coordinates(line, include_z=True))
+    assert metrics["elevation_gain"] == 0
+    assert metrics["elevation_loss"] == 0
+    assert metrics["min_altitude"] is None
+    assert metrics["max_slope"] is None
+    assert metrics["distance"] == pytest.approx(scalar_distance(line), rel=1e-9)
+
+
+def test_smooth_altitudes_keeps_length_and_mean():
+    altitudes = np.array([0.0, 10.0, 0.0, 10.0, 0.0, 10.0])
+    smoothed = smooth_altitudes(altitudes, 3)
+    assert len(smoothed) == len(altitudes)
+    assert smoothed[1:-1] == pytest.approx([10 / 3, 20 / 3, 10 / 3, 20 / 3])
+    assert smooth_altitudes(altitudes, 1) is altitudes
+
+
+@pytest.mark.parametrize("line", TRACKS)
+def test_compute_trail_metrics(line):
+    metrics = compute_trail_metrics(line)
+    assert metrics["distance"] == pytest.approx(scalar_distance(line), rel=1e-9)
+    assert metrics["elevation_gain"] == pytest.approx(scalar_elevation_gain(line))
+    assert (metrics["bbox_west"], metrics["bbox_south"], metrics["bbox_east"], metrics["bbox_north"]) == line.bounds
+    assert (metrics["start_lng"], metrics["start_lat"]) == line.coords[0][:2]
+
+
+def test_compute_trail_metrics_empty():
+    assert set(compute_trail_metrics(None).values()) == {None}
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from app.trail_encoding import (
+    PRECISION, ELEVATION_PRECISION, encode_polyline, encode_elevation, quantized_deltas, to_delta, to_polyline,
+    to_protobuf,
+)
+
+COORDINATES = [
+    np.array([[-120.2, 38.5, 0.0], [-120.95, 40.7, 0.0], [-126.453, 43.252, 0.0]]),
+    np.array([[55.5, -21.1, 1520.34], [55.50001, -21.10004, 1519.96], [55.49998, -21.1, 2071.05]]),
+    np.column_stack((
+        55.5 + np.cumsum(np.random.default_rng(0).normal(0, 1e-4, 1000)),
+        -21.1 + np.cumsum(np.random.default_rng(1).normal(0, 1e-4, 1000)),
+        500 + np.cumsum(np.random.default_rng(2).normal(0, 5, 1000)),
+    )),
+]
+
+
+# Encodeurs / décodeurs scalaires de référence
+
+def scalar_polyline(values, precision):
+    # Algorithme "encoded polyline" de Google, point par point
+    result, previous = [], [0] * len(values[0])
+    for point in values:
+        for index, value in enumerate(point):
+            scaled = int(round(value * 10 ** precision))
+            delta, previous[index] = scaled - previous[index], scaled
+            delta = ~(delta << 1) if delta < 0 else delta << 1
+            while delta >= 0x20:
+                result.append(chr((0x20 | (delta & 0x1f)) + 63))
+                delta >>= 5
+            result.append(chr(delta + 63))
+    return "".join(result)
+
+
+def read_varint(data, position):
+    result = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7f) << shift
+        shift += 7
+        if not byte & 0x80:
+            return result, position
+
+
+def decode_protobuf(data, unsigned=(7,)):
+    fields, position = {}, 0
+    while position < len(data):
+        key, position = read_varint(data, position)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            fields[field], position = read_varint(data, position)
+        else:
+            length, position = read_varint(data, position)
+            end, values = position + length, []
+            while position < end:
+                value, position = read_varint(data, position)
+                values.append(value if field in unsigned else (value >> 1) ^ -(value & 1))
+            fields[field] = values
+    return fields
+
+
+def test_polyline_reference_example():
+    # Exemple de la documentation Google
+    assert encode_polyline(COORDINATES[0]) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+
+@pytest.mark.parametrize("coordinates", COORDINATES)
+def test_polyline_matches_scalar(coordinates):
+    assert encode_polyline(coordinates) == scalar_polyline(coordinates[:, [1, 0]].tolist(), PRECISION)
+    assert encode_elevation(coordinates)[0] == scalar_polyline(coordinates[:, [2]].tolist(), ELEVATION_PRECISION)
+
+
+@pytest.mark.parametrize("coordinates", COORDINATES)
+def test_delta_round_trip(coordinates):
+    encoded = to_delta(7, coordinates)
+    assert np.cumsum(encoded["lng"]).tolist() == [int(round(v * 10 ** PRECISION)) for v in coordinates[:, 0]]
+    assert np.cumsum(encoded["lat"]).tolist() == [int(round(v * 10 ** PRECISION)) for v in coordinates[:, 1]]
+    assert np.cumsum(encoded["ele"]).tolist() == [int(round(v * 10 ** ELEVATION_PRECISION)) for v in coordinates[:, 2]]
+
+
+@pytest.mark.parametrize("coordinates", COORDINATES)
+def test_protobuf_round_trip(coordinates):
+    fields = decode_protobuf(to_protobuf(42, coordinates))
+    assert fields[1] == 42
+    assert fields[2] == PRECISION
+    assert fields[3] == ELEVATION_PRECISION
+    assert fields[4] == quantized_deltas(coordinates[:, 0], PRECISION).tolist()
+    assert fields[5] == quantized_deltas(coordinates[:, 1], PRECISION).tolist()
+    assert fields[6] == quantized_deltas(coordinates[:, 2], ELEVATION_PRECISION).tolist()
+    assert 7 not in fields
+
+
+def test_missing_altitudes_are_flagged():
+    coordinates = np.array([[55.5, -21.1, np.nan], [55.6, -21.2, 1520.0], [55.7, -21.3, np.nan], [55.8, -21.4, 1530.0]])
+    encoded = to_delta(7, coordinates)
+    # Aucun faux delta vers 0 m : les points manquants reprennent l'altitude connue
+    assert np.cumsum(encoded["ele"]).tolist() == [15200, 15200, 15200, 15300]
+    assert encoded["ele_missing"].tolist() == [0, 2]
+    fields = decode_protobuf(to_protobuf(7, coordinates))
+    assert fields[6] == encoded["ele"].tolist()
+    assert fields[7] == [0, 2]
+    assert to_polyline(7, coordinates)["elevation_missing"].tolist() == [0, 2]
+
+
+def test_trail_without_altitude_has_no_elevation():
+    coordinates = np.array([[55.5, -21.1, np.nan], [55.6, -21.2, np.nan]])
+    assert to_polyline(7, coordinates)["elevation"] is None
+    assert to_delta(7, coordinates)["ele"] is None
+    fields = decode_protobuf(to_protobuf(7, coordinates))
+    assert 6 not in fields
+    assert fields[7] == [0, 1]